@@ -0,0 +1,142 @@
+"""Memory and time benchmark of the Clausius sensor entities.
+
+Sets up the sensor platform for a number of devices, as many config
+entries would, and reports the memory the entities hold, the time taken
+to create them, and the time of one state calculation per entity, the
+work behind every state write. Nothing is fetched and no state is
+written, the entities are not added to Home Assistant. The data comes
+from the synthetic pages in fixtures/.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/bench_entities.py
+    python benchmarks/bench_entities.py --devices 100 --updates 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.clausius import sensor  # noqa: E402
+from custom_components.clausius.const import (  # noqa: E402
+    CLAUSIUS_ENDPOINTS,
+    CLAUSIUS_ENTITIES,
+    DOMAIN,
+)
+from custom_components.clausius.coordinator import (  # noqa: E402
+    ClausiusDataUpdateCoordinator,
+)
+
+
+def make_entry(index: int) -> SimpleNamespace:
+    """Return the parts of a config entry the coordinator and platform read."""
+    return SimpleNamespace(
+        entry_id=f"benchmark{index}",
+        data={
+            "host": f"192.0.2.{index % 250 + 1}",
+            "port": 8080 + index // 250,
+            "username": "",
+            "password": "",
+        },
+        options={},
+        async_on_unload=lambda remove: None,
+    )
+
+
+def load_data(coordinator: ClausiusDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the merged data of the fixture pages."""
+    for endpoint in CLAUSIUS_ENDPOINTS:
+        content = (FIXTURES / endpoint).read_text(encoding="utf-8")
+        coordinator._endpoint_data[endpoint] = coordinator._parse_endpoint_content(
+            endpoint, content
+        )
+    return coordinator._merge_data(time.time())
+
+
+async def run(args: argparse.Namespace, config_dir: str) -> None:
+    """Set up the entities and print the report."""
+    hass = HomeAssistant(config_dir)
+    entries = [make_entry(index) for index in range(args.devices)]
+    coordinators = [ClausiusDataUpdateCoordinator(hass, entry) for entry in entries]
+    data = load_data(coordinators[0])
+    hass.data[DOMAIN] = {}
+    for entry, coordinator in zip(entries, coordinators):
+        hass.data[DOMAIN][entry.entry_id] = coordinator
+        coordinator.data = data
+    entities: list[Any] = []
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    for entry in entries:
+        await sensor.async_setup_entry(hass, entry, entities.extend)
+    setup_time = time.perf_counter() - started
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Polled sensors are written on every refresh, the rest periodically
+    polled = [
+        entity for entity in entities if isinstance(entity, sensor.ClausiusSensor)
+    ]
+    platform = SimpleNamespace(
+        platform_name=DOMAIN,
+        domain="sensor",
+        platform_translations={},
+        default_language_platform_translations={},
+        component_translations={},
+    )
+    for entity in polled:
+        entity.hass = hass
+        entity.platform = platform
+    started = time.perf_counter()
+    for _ in range(args.updates):
+        for entity in polled:
+            entity._async_calculate_state()
+            entity.device_info
+    update_time = time.perf_counter() - started
+    calculations = args.updates * len(polled)
+
+    count = len(entities)
+    print(
+        f"{args.devices} devices x {len(CLAUSIUS_ENTITIES)} polled sensors, "
+        f"{count} entities in all"
+    )
+    print(f"{'entity memory (KiB)':<28}{(after - before) / 1024:>12.1f}")
+    print(f"{'memory per entity (B)':<28}{(after - before) / count:>12.0f}")
+    print(f"{'setup per entity (us)':<28}{setup_time / count * 1e6:>12.2f}")
+    print(f"{'state per update (us)':<28}{update_time / calculations * 1e6:>12.2f}")
+
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+    await hass.async_stop(force=True)
+
+
+def main() -> int:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument(
+        "--updates", type=int, default=100, help="state calculations per entity"
+    )
+    with tempfile.TemporaryDirectory() as config_dir:
+        asyncio.run(run(parser.parse_args(), config_dir))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""Micro-benchmarks for the Clausius page parsers.
+
+Runs every parser of ClausiusDataUpdateCoordinator over the pages in
+fixtures/ and reports the median time and the peak memory of one call.
+The pages are synthetic, written to the shape of the device pages; they
+give the parsers realistic work, not the labels or values of a device.
+Times are compared relative to a reference workload measured in the same
+run, plain splitting and regex scanning of the same pages, so a baseline
+taken on another machine still applies. The script exits non-zero when a
+parser got slower or allocates more than the allowed threshold compared
+with baseline.json.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+sys.path.insert(0, str(ROOT))
+
+from custom_components.clausius.const import (  # noqa: E402
+    CLAUSIUS_ENDPOINTS,
+    CLAUSIUS_INFORMACION_PATH,
+    CLAUSIUS_STATUS_PATH,
+    CLAUSIUS_TEMPERATURAS_PATH,
+)
+from custom_components.clausius.metrics import PollMetrics  # noqa: E402
+from custom_components.clausius.parser import LineIndex  # noqa: E402
+from custom_components.clausius.coordinator import (  # noqa: E402
+    ClausiusDataUpdateCoordinator,
+)
+
+
+def load_fixtures() -> dict[str, str]:
+    """Return the fixture page of every endpoint."""
+    return {
+        endpoint: (FIXTURES / endpoint).read_text(encoding="utf-8")
+        for endpoint in CLAUSIUS_ENDPOINTS
+    }
+
+
+def make_coordinator() -> ClausiusDataUpdateCoordinator:
+    """Return a coordinator with just the state the parsers use."""
+    coordinator = ClausiusDataUpdateCoordinator.__new__(ClausiusDataUpdateCoordinator)
+    coordinator._informacion_index = LineIndex()
+    coordinator._layout = coordinator._informacion_index.as_dict()
+    coordinator.config_entry = None
+    coordinator.host = "benchmark"
+    coordinator.metrics = PollMetrics()
+    return coordinator
+
+
+def cases(pages: dict[str, str]) -> dict[str, Callable[[], Any]]:
+    """Return the benchmarked calls by name."""
+    warm = make_coordinator()
+    # Locate the informacion.html lines once, as on the first poll
+    warm._parse_informacion(pages[CLAUSIUS_INFORMACION_PATH])
+
+    def parse_informacion_cold() -> Any:
+        return make_coordinator()._parse_informacion(
+            pages[CLAUSIUS_INFORMACION_PATH]
+        )
+
+    def parse_endpoint_content() -> Any:
+        for endpoint, content in pages.items():
+            warm._parse_endpoint_content(endpoint, content)
+
+    return {
+        "parse_temperaturas": lambda: warm._parse_temperaturas(
+            pages[CLAUSIUS_TEMPERATURAS_PATH]
+        ),
+        "parse_status": lambda: warm._parse_status(pages[CLAUSIUS_STATUS_PATH]),
+        "parse_informacion": lambda: warm._parse_informacion(
+            pages[CLAUSIUS_INFORMACION_PATH]
+        ),
+        "parse_informacion_cold": parse_informacion_cold,
+        "parse_endpoint_content": parse_endpoint_content,
+    }
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def reference(pages: dict[str, str]) -> Callable[[], Any]:
+    """Return the reference workload, independent of the parsers."""
+
+    def scan() -> Any:
+        for content in pages.values():
+            for line in content.split("\n"):
+                _TAG_RE.findall(line.lower())
+
+    return scan
+
+
+def median_time(func: Callable[[], Any], repeat: int) -> float:
+    """Return the median time per call in microseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return statistics.median(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def measure(
+    func: Callable[[], Any], repeat: int, reference_us: float
+) -> dict[str, float]:
+    """Return the time per call, relative to the reference, and peak bytes."""
+    time_us = median_time(func, repeat)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "time_us": round(time_us, 2),
+        "relative": round(time_us / reference_us, 4),
+        "peak_bytes": peak,
+    }
+
+
+def main() -> int:
+    """Run the benchmarks and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="fail when a metric exceeds baseline times this factor",
+    )
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write the results to baseline.json instead of comparing",
+    )
+    args = parser.parse_args()
+
+    pages = load_fixtures()
+    reference_us = median_time(reference(pages), args.repeat)
+    results = {
+        name: measure(func, args.repeat, reference_us)
+        for name, func in cases(pages).items()
+    }
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    baseline_results = baseline.get("benchmarks", {})
+    regressions = []
+    print(f"reference workload: {reference_us:.2f} us")
+    print(f"{'benchmark':<26}{'time (us)':>12}{'peak (B)':>12}{'vs baseline':>14}")
+    for name, metrics in results.items():
+        ratio = ""
+        if name in baseline_results:
+            # Absolute times depend on the machine, compare relative ones
+            ratios = {
+                metric: metrics[metric] / baseline_results[name][metric]
+                for metric in ("relative", "peak_bytes")
+                if baseline_results[name].get(metric)
+            }
+            ratio = f"x{ratios.get('relative', 0):.2f}"
+            regressions += [
+                f"{name} {'time' if metric == 'relative' else metric}: x{value:.2f}"
+                for metric, value in ratios.items()
+                if value > args.threshold
+            ]
+        print(
+            f"{name:<26}{metrics['time_us']:>12.2f}"
+            f"{metrics['peak_bytes']:>12}{ratio:>14}"
+        )
+
+    if args.update_baseline:
+        baseline = {"reference_us": round(reference_us, 2), "benchmarks": results}
+        BASELINE.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE.name}")
+        return 0
+
+    if regressions:
+        print(f"Regressions over x{args.threshold}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Replay captured Clausius traffic through the coordinator offline.
+
+Reads the archives written with the Capture traffic option (the
+clausius_captures folder of the Home Assistant config directory), feeds
+every response through the page parsers and the coordinator's
+processing at full speed, and reports parse times, fields that came out
+empty and the derived compressor and energy totals. Exits non-zero with
+--strict when any field was missed, so captures from a firmware can be
+used as a regression test.
+
+Run from the repository root with Home Assistant installed:
+
+    python benchmarks/replay_captures.py /config/clausius_captures
+    python benchmarks/replay_captures.py capture.jsonl.gz --strict
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.clausius.capture import iter_captures, replay  # noqa: E402
+from custom_components.clausius.const import (  # noqa: E402
+    CLAUSIUS_ENDPOINTS,
+    CLAUSIUS_FIELDS,
+)
+from custom_components.clausius.coordinator import (  # noqa: E402
+    ClausiusDataUpdateCoordinator,
+)
+
+
+async def run(args: argparse.Namespace, config_dir: str) -> int:
+    """Replay the captures and print the report."""
+    # A throwaway config directory keeps the field cache out of the tree
+    hass = HomeAssistant(config_dir)
+    # Only the options are read from the entry, no config entry is set up
+    entry = SimpleNamespace(
+        entry_id="replay",
+        data={"host": "replay", "port": 80, "username": "", "password": ""},
+        options={"heating_flow": args.heating_flow},
+    )
+    coordinator = ClausiusDataUpdateCoordinator(hass, entry)
+
+    fields = {
+        endpoint: [
+            key for key, field in CLAUSIUS_FIELDS.items()
+            if field["endpoint"] == endpoint
+        ]
+        for endpoint in CLAUSIUS_ENDPOINTS
+    }
+    missed = {endpoint: {} for endpoint in CLAUSIUS_ENDPOINTS}
+    responses = 0
+    data = {}
+
+    started = time.perf_counter()
+    for response, parsed, data in replay(coordinator, iter_captures(args.paths)):
+        responses += 1
+        # The merged data holds cached values, misses show in the parse
+        for key in fields[response.endpoint]:
+            if parsed.get(key) is None:
+                missed[response.endpoint][key] = (
+                    missed[response.endpoint].get(key, 0) + 1
+                )
+    elapsed = time.perf_counter() - started
+    await coordinator.async_shutdown()
+
+    rate = responses / elapsed if elapsed else 0.0
+    print(f"Replayed {responses} responses in {elapsed:.2f}s ({rate:.0f}/s)")
+    print(f"{'endpoint':<20}{'parses':>8}{'mean (ms)':>12}{'max (ms)':>12}")
+    for endpoint, metrics in coordinator.metrics.endpoints.items():
+        parse_time = metrics.parse_time.as_dict()
+        print(
+            f"{endpoint:<20}{parse_time['count']:>8}"
+            f"{parse_time['mean_ms'] or 0:>12.3f}{parse_time['max_ms']:>12.3f}"
+        )
+    print(f"Compressor starts: {data.get('compressor_starts')}")
+    print(f"Thermal energy: {data.get('thermal_energy')} kWh")
+
+    misses = [
+        f"{endpoint} {key}: {count}"
+        for endpoint, keys in missed.items()
+        for key, count in keys.items()
+    ]
+    if misses:
+        print("Fields missed:")
+        for miss in misses:
+            print(f"  {miss}")
+    return 1 if misses and args.strict else 0
+
+
+def main() -> int:
+    """Parse the arguments and run the replay."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "paths", nargs="+", help="capture archives or directories of them"
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="exit non-zero when any field was missed",
+    )
+    parser.add_argument(
+        "--heating-flow",
+        type=float,
+        default=0.0,
+        help="heating flow in l/min, to replay thermal energy",
+    )
+    with tempfile.TemporaryDirectory() as config_dir:
+        return asyncio.run(run(parser.parse_args(), config_dir))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
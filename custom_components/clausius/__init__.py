@@ -3,26 +3,107 @@ from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, LOGGER
+from .const import CLAUSIUS_ENTITIES, DOMAIN, LOGGER
+from .cache import field_cache_store
+from .cycles import cycles_store
+from .derived import thermal_store
+from .coordinator import ClausiusDataUpdateCoordinator
+from .services import async_setup_services
 
 # List of platforms this integration should support
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services of the Clausius integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Clausius integration from a config entry."""
     LOGGER.info("Setting up Clausius integration")
 
-    # Store integration data for use by platforms
+    # Unique IDs used to be the same for every device, make them per entry
+    @callback
+    def _migrate_unique_id(entity_entry: er.RegistryEntry) -> dict | None:
+        key = entity_entry.unique_id.removeprefix("clausius_")
+        if key != entity_entry.unique_id and key in CLAUSIUS_ENTITIES:
+            return {"new_unique_id": f"{entry.entry_id}_{key}"}
+        return None
+
+    await er.async_migrate_entries(hass, entry.entry_id, _migrate_unique_id)
+
+    coordinator = ClausiusDataUpdateCoordinator(hass, entry)
+    try:
+        await _async_start_coordinator(hass, entry, coordinator)
+    except Exception:
+        # A failed setup is not unloaded, give up the poll slot and the
+        # connections of the device here
+        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        await coordinator.async_shutdown()
+        raise
+    return True
+
+
+async def _async_start_coordinator(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: ClausiusDataUpdateCoordinator
+) -> None:
+    """Load the saved state of a coordinator, set up its sensors and poll."""
+    # Values fetched before the restart are served until they expire
+    await coordinator.fields.async_load()
+    # Compressor starts and thermal energy carry on from the last run
+    await coordinator.cycles.async_load()
+    await coordinator.thermal.async_load()
+    # Hours still open at the last shutdown keep aggregating
+    await coordinator.statistics.async_load()
+
+    # Poll only the pages feeding enabled entities, follow entities being
+    # enabled or disabled
+    coordinator.async_select_endpoints()
+
+    @callback
+    def _async_registry_updated(event: Event) -> None:
+        if "disabled_by" in event.data.get("changes", {}):
+            coordinator.async_select_endpoints()
+
+    entry.async_on_unload(
+        hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, _async_registry_updated
+        )
+    )
+
+    # Store the coordinator for use by platforms and diagnostics
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = entry.data
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+
+    # Import the hours closed since the last run into long-term statistics
+    entry.async_on_unload(
+        async_track_utc_time_change(
+            hass, coordinator.statistics.async_flush, minute=1, second=0
+        )
+    )
 
     # Forward the setup to the sensor platform
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    return True
+    # Sensors start from their restored values, the first refresh runs in
+    # the background so an unreachable device does not hold up startup
+    entry.async_create_background_task(
+        hass,
+        coordinator.async_refresh(),
+        f"{DOMAIN} first refresh {coordinator.host}",
+    )
+
+    # Reload when options change so new polling intervals take effect
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -40,5 +121,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
\ No newline at end of file
+    # Layouts detected while polling are saved to the entry data, only
+    # changed options need a reload
+    coordinator: ClausiusDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    if entry.options == coordinator.options:
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached fields and counters of a deleted config entry."""
+    await field_cache_store(hass, entry.entry_id).async_remove()
+    await cycles_store(hass, entry.entry_id).async_remove()
+    await thermal_store(hass, entry.entry_id).async_remove()
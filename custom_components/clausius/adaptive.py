@@ -0,0 +1,68 @@
+"""Adaptive polling interval of a Clausius heat pump."""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from .const import (
+    ADAPTIVE_BACKOFF,
+    ADAPTIVE_STATE_FIELDS,
+    ADAPTIVE_TEMPERATURE_FIELDS,
+    ADAPTIVE_TEMPERATURE_STEP,
+    COMPRESSOR_TRANSITIONS,
+)
+
+
+class AdaptivePolling:
+    """Polling interval following how fast the readings change.
+
+    Samples are observed as they are fetched and the interval is updated
+    once per poll: a compressor powering on or off, or a change of the
+    compressor or pump status, drops it to the floor; a temperature moving
+    by ADAPTIVE_TEMPERATURE_STEP or more halves it; a poll of steady
+    readings lengthens it by ADAPTIVE_BACKOFF, up to the ceiling.
+    """
+
+    def __init__(self, floor: float, ceiling: float) -> None:
+        """Initialize at the floor, polling fast until readings settle."""
+        self.floor = floor
+        self.ceiling = max(floor, ceiling)
+        self.interval = float(floor)
+        # Last value observed of every watched field
+        self._last: dict[str, Any] = {}
+        self._transition = False
+        self._moved = False
+        self._observed = False
+
+    def observe(self, data: Mapping[str, Any]) -> None:
+        """Compare freshly fetched values with the ones seen before."""
+        self._observed = True
+        if data.get("compressor_status") in COMPRESSOR_TRANSITIONS:
+            self._transition = True
+        for field in ADAPTIVE_STATE_FIELDS:
+            value = data.get(field)
+            if value is None:
+                continue
+            if self._last.get(field, value) != value:
+                self._transition = True
+            self._last[field] = value
+        for field in ADAPTIVE_TEMPERATURE_FIELDS:
+            value = data.get(field)
+            if value is None:
+                continue
+            last = self._last.get(field)
+            # Slow drift adds up, it is measured from the last move
+            if last is None or abs(value - last) >= ADAPTIVE_TEMPERATURE_STEP:
+                self._moved = self._moved or last is not None
+                self._last[field] = value
+
+    def update(self) -> float:
+        """Return the interval for the next poll from the samples observed."""
+        if self._transition:
+            self.interval = self.floor
+        elif self._moved:
+            self.interval = max(self.floor, self.interval / 2)
+        elif self._observed:
+            self.interval = min(self.ceiling, self.interval * ADAPTIVE_BACKOFF)
+        self._transition = self._moved = self._observed = False
+        return self.interval
@@ -0,0 +1,138 @@
+"""HTTP client for the Clausius heat pump web interface."""
+
+from __future__ import annotations
+
+import base64
+import logging
+from typing import Mapping
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+
+from .const import (
+    CLAUSIUS_BASE_URL,
+    CLAUSIUS_ENDPOINTS,
+    DEFAULT_BACKOFF_BASE,
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_REQUEST_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ClausiusClient:
+    """Keep-alive HTTP client for one Clausius device.
+
+    The Basic auth header, the endpoint URLs and the request timeout are
+    built once. A private connector keeps one persistent connection per
+    endpoint to the device's small embedded web server, reused by every
+    poll instead of a new TCP handshake per request. It is closed with the
+    client, or when Home Assistant stops, which does not unload entries.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    ) -> None:
+        """Initialize the client, must be called from the event loop."""
+        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+        self._headers = {"Authorization": f"Basic {credentials}"}
+        self.base_url = CLAUSIUS_BASE_URL.format(host=host, port=port)
+        self.urls = {
+            endpoint: f"{self.base_url}/{endpoint}" for endpoint in CLAUSIUS_ENDPOINTS
+        }
+        self._timeout = aiohttp.ClientTimeout(total=DEFAULT_REQUEST_TIMEOUT)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit_per_host=len(CLAUSIUS_ENDPOINTS),
+                keepalive_timeout=keepalive_timeout,
+            ),
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+        self._unsub_close = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_close_at_stop
+        )
+
+    async def get(
+        self, endpoint: str, headers: Mapping[str, str] | None = None
+    ) -> aiohttp.ClientResponse:
+        """Request an endpoint, the caller must release the response."""
+        url = self.urls[endpoint]
+        request_headers = {**self._headers, **headers} if headers else self._headers
+        try:
+            return await self._session.get(
+                url, headers=request_headers, timeout=self._timeout
+            )
+        except aiohttp.ServerDisconnectedError:
+            # The device dropped an idle keep-alive connection, retry once
+            # on a fresh one
+            _LOGGER.debug(f"Connection for {endpoint} was closed, reconnecting")
+            return await self._session.get(
+                url, headers=request_headers, timeout=self._timeout
+            )
+
+    async def close(self) -> None:
+        """Close the persistent connections."""
+        self._unsub_close()
+        await self._session.close()
+
+    async def _async_close_at_stop(self, event: Event) -> None:
+        """Close the persistent connections when Home Assistant stops."""
+        await self._session.close()
+
+
+class CircuitBreaker:
+    """Backs off polling of a device after consecutive failed polls.
+
+    After threshold failures in a row the breaker opens: polls are held
+    back for a delay that doubles with every further failure, up to
+    max_delay. While open, a single probe request decides whether the
+    breaker closes again.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        base_delay: float = DEFAULT_BACKOFF_BASE,
+        max_delay: float = DEFAULT_BACKOFF_MAX,
+    ) -> None:
+        """Initialize a closed breaker."""
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failures = 0
+        self._retry_at = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while polling is backed off."""
+        return self.failures >= self.threshold
+
+    def retry_in(self, now: float) -> float:
+        """Return the seconds left until the next probe is allowed."""
+        return max(0.0, self._retry_at - now)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful poll."""
+        self.failures = 0
+        self._retry_at = 0.0
+
+    def record_failure(self, now: float) -> float:
+        """Count a failed poll, return the backoff delay once open."""
+        self.failures += 1
+        if not self.is_open:
+            return 0.0
+        delay = min(
+            self.base_delay * 2 ** (self.failures - self.threshold), self.max_delay
+        )
+        self._retry_at = now + delay
+        return delay
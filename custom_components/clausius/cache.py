@@ -0,0 +1,96 @@
+"""Last known good values of the fields of a Clausius heat pump."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Mapping
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import CLAUSIUS_FIELDS, DOMAIN, FIELD_CACHE_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def field_cache_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store of the field cache of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.fields")
+
+
+class FieldCache:
+    """Last known good value of every field, with the time it was fetched.
+
+    Fresh results are merged over the cached values field by field, so a
+    page that fails or misses a value does not take the others with it.
+    A value is served until it is older than the TTL of its field, then
+    it expires. The cache is saved to storage, a few seconds after the
+    last change, and survives restarts.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, ttls: Mapping[str, float]
+    ) -> None:
+        """Initialize with the TTL in seconds of every field."""
+        self._store = field_cache_store(hass, entry_id)
+        self._ttls = ttls
+        # Field to (value, wall-clock time it was fetched)
+        self._values: dict[str, tuple[Any, float]] = {}
+        # Fields whose value outlived its TTL at the last lookup
+        self.expired: frozenset[str] = frozenset()
+
+    async def async_load(self) -> None:
+        """Load the values saved by the last run."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        self._values = {
+            field: (value, fetched_at)
+            for field, (value, fetched_at) in stored["values"].items()
+            if field in CLAUSIUS_FIELDS
+        }
+        _LOGGER.debug(f"Loaded {len(self._values)} cached fields")
+
+    def update(self, timestamp: float, data: Mapping[str, Any]) -> None:
+        """Store the values of freshly fetched fields."""
+        changed = False
+        for field, value in data.items():
+            if value is not None and field in CLAUSIUS_FIELDS:
+                self._values[field] = (value, timestamp)
+                changed = True
+        if changed:
+            self._store.async_delay_save(self._data_to_save, FIELD_CACHE_SAVE_DELAY)
+
+    def values(self, now: float) -> dict[str, Any]:
+        """Return the value of every field, None once it expired."""
+        data = dict.fromkeys(CLAUSIUS_FIELDS)
+        expired = set()
+        for field, (value, fetched_at) in self._values.items():
+            if now - fetched_at > self._ttls[field]:
+                expired.add(field)
+            else:
+                data[field] = value
+        self.expired = frozenset(expired)
+        return data
+
+    def fetched_at(self, *fields: str) -> float | None:
+        """Return when the oldest of the fields was fetched."""
+        times = [self._values[field][1] for field in fields if field in self._values]
+        return min(times) if len(times) == len(fields) else None
+
+    def ages(self, now: float) -> dict[str, float]:
+        """Return the age in seconds of every cached field."""
+        return {
+            field: round(now - fetched_at, 1)
+            for field, (_, fetched_at) in self._values.items()
+        }
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the values to save."""
+        return {
+            "values": {
+                field: [value, fetched_at]
+                for field, (value, fetched_at) in self._values.items()
+            }
+        }
@@ -0,0 +1,188 @@
+"""Capture and replay of the traffic of a Clausius heat pump.
+
+Captured responses are written as gzip compressed JSON lines, one object
+per response:
+
+    {"time": 1732900000.5, "endpoint": "status.html", "status": 200,
+     "latency_ms": 41.2, "encoding": "iso-8859-1",
+     "headers": {"ETag": "..."}, "body": "..."}
+
+The body holds the raw bytes decoded as latin-1, which maps every byte to
+one character and back, so a replay sees exactly what the device sent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, Mapping, NamedTuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import DEFAULT_CAPTURE_FILE_SIZE, DEFAULT_CAPTURE_FILES
+
+if TYPE_CHECKING:
+    from .coordinator import ClausiusDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Response headers kept in captures, the ones the coordinator looks at
+CAPTURED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class CapturedResponse(NamedTuple):
+    """One response read back from a capture archive."""
+
+    time: float
+    endpoint: str
+    status: int
+    latency_ms: float
+    encoding: str
+    headers: dict[str, str]
+    body: bytes | None
+
+    @property
+    def text(self) -> str:
+        """Return the body decoded as the device's page."""
+        return (self.body or b"").decode(self.encoding, errors="replace")
+
+
+class CaptureWriter:
+    """Writes captured responses to rotated compressed archives.
+
+    Responses are buffered in memory and written by async_flush in the
+    executor, so capturing adds no file I/O to the poll itself. A new
+    archive is started once the current one holds max_bytes of JSON, and
+    only the newest max_files archives are kept.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        directory: Path,
+        prefix: str,
+        max_bytes: int = DEFAULT_CAPTURE_FILE_SIZE,
+        max_files: int = DEFAULT_CAPTURE_FILES,
+    ) -> None:
+        """Initialize the writer, archives are created on first flush."""
+        self._hass = hass
+        self._directory = directory
+        self._prefix = prefix
+        self._max_bytes = max_bytes
+        self._max_files = max_files
+        self._pending: list[str] = []
+        self._file: IO[str] | None = None
+        self._written = 0
+        self._lock = asyncio.Lock()
+
+    def add(
+        self,
+        timestamp: float,
+        endpoint: str,
+        status: int,
+        latency_ms: float,
+        encoding: str,
+        headers: Mapping[str, str],
+        body: bytes | None,
+    ) -> None:
+        """Buffer a response for the next flush."""
+        record = {
+            "time": timestamp,
+            "endpoint": endpoint,
+            "status": status,
+            "latency_ms": round(latency_ms, 2),
+            "encoding": encoding,
+            "headers": {
+                name: headers[name] for name in CAPTURED_HEADERS if name in headers
+            },
+            "body": None if body is None else body.decode("latin-1"),
+        }
+        self._pending.append(json.dumps(record, separators=(",", ":")))
+
+    async def async_flush(self) -> None:
+        """Write the buffered responses."""
+        async with self._lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            await self._hass.async_add_executor_job(self._write, lines)
+
+    async def async_close(self) -> None:
+        """Write what is left and close the archive."""
+        await self.async_flush()
+        async with self._lock:
+            if self._file is not None:
+                await self._hass.async_add_executor_job(self._file.close)
+                self._file = None
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines to the archive, rotating it when full."""
+        for line in lines:
+            if self._file is None or self._written >= self._max_bytes:
+                self._rotate()
+            self._file.write(line + "\n")
+            self._written += len(line) + 1
+        self._file.flush()
+
+    def _rotate(self) -> None:
+        """Start a new archive and drop the oldest ones."""
+        if self._file is not None:
+            self._file.close()
+        self._directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = self._directory / f"{self._prefix}-{stamp}.jsonl.gz"
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._written = 0
+        _LOGGER.debug(f"Capturing traffic to {path}")
+
+        archives = sorted(self._directory.glob(f"{self._prefix}-*.jsonl.gz"))
+        for old in archives[: -self._max_files]:
+            old.unlink()
+
+
+def iter_captures(paths: Iterable[str | Path]) -> Iterator[CapturedResponse]:
+    """Yield the responses of capture archives or directories of them."""
+    for path in map(Path, paths):
+        files = sorted(path.glob("*.jsonl.gz")) if path.is_dir() else [path]
+        for file in files:
+            with gzip.open(file, "rt", encoding="utf-8") as archive:
+                try:
+                    for line in archive:
+                        yield _read_record(json.loads(line))
+                except (EOFError, json.JSONDecodeError):
+                    # The archive being written when Home Assistant stopped
+                    _LOGGER.warning(f"Capture {file} is truncated, skipping the rest")
+
+
+def _read_record(record: dict[str, Any]) -> CapturedResponse:
+    """Return the response of a capture record."""
+    body = record["body"]
+    return CapturedResponse(
+        time=record["time"],
+        endpoint=record["endpoint"],
+        status=record["status"],
+        latency_ms=record["latency_ms"],
+        encoding=record["encoding"],
+        headers=record["headers"],
+        body=None if body is None else body.encode("latin-1"),
+    )
+
+
+def replay(
+    coordinator: ClausiusDataUpdateCoordinator,
+    responses: Iterable[CapturedResponse],
+) -> Iterator[tuple[CapturedResponse, dict[str, Any], dict[str, Any]]]:
+    """Feed captured responses through a coordinator offline.
+
+    Every response is processed with apply_response as if just fetched
+    at its capture time, then the fields read from it and the merged data
+    are yielded. Nothing is requested and no time passes, so a replay
+    runs as fast as the parsers.
+    """
+    for response in responses:
+        if (applied := coordinator.apply_response(response)) is not None:
+            yield response, *applied
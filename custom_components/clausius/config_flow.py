@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
+import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -13,11 +15,39 @@ from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT, CONF_USERNA
 from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 
+from .api import ClausiusClient
 from .const import (
+    CLAUSIUS_ENDPOINTS,
+    CLAUSIUS_ENTITIES,
+    CLAUSIUS_INFORMACION_PATH,
+    CONF_ADAPTIVE,
+    CONF_ADAPTIVE_CEILING,
+    CONF_ADAPTIVE_FLOOR,
+    CONF_AGGREGATE_INTERVAL,
+    CONF_CAPTURE,
+    CONF_FIELD_TTL,
+    CONF_HEAT_CAPACITY,
+    CONF_HEATING_FLOW,
+    CONF_INFORMACION_INTERVAL,
+    CONF_LAYOUT,
+    CONF_SCAN_INTERVAL,
+    CONF_STATUS_INTERVAL,
+    CONF_STREAMING,
+    CONF_TEMPERATURAS_INTERVAL,
+    DEFAULT_ADAPTIVE_CEILING,
+    DEFAULT_ADAPTIVE_FLOOR,
+    DEFAULT_AGGREGATE_INTERVAL,
     DEFAULT_CONFIG,
+    DEFAULT_FIELD_TTL,
+    DEFAULT_HEAT_CAPACITY,
+    DEFAULT_HEATING_FLOW,
+    DEFAULT_INFORMACION_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     ERROR_CONNECTION_FAILED,
 )
+from .filters import filter_defaults, filter_option_keys
+from .parser import detect_layout
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,15 +70,25 @@ class ClausiusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             self._data.update(user_input)
-            # Don't test connection in config flow to avoid errors
-            return await self._async_create_entry()
+            statuses, pages = await self._async_probe_pages()
+            if 401 in statuses:
+                errors["base"] = "authentication"
+            elif not pages:
+                errors["base"] = "connection"
+            else:
+                self._detect_layout(pages)
+                return await self._async_create_entry()
 
         data_schema = vol.Schema(
             {
-                vol.Required(CONF_HOST, default=DEFAULT_CONFIG[CONF_HOST]): cv.string,
-                vol.Required(CONF_PORT, default=DEFAULT_CONFIG[CONF_PORT]): vol.All(
-                    vol.Coerce(int), vol.Range(min=1, max=65535)
-                ),
+                vol.Required(
+                    CONF_HOST,
+                    default=self._data.get(CONF_HOST, DEFAULT_CONFIG[CONF_HOST]),
+                ): cv.string,
+                vol.Required(
+                    CONF_PORT,
+                    default=self._data.get(CONF_PORT, DEFAULT_CONFIG[CONF_PORT]),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=65535)),
                 vol.Required(CONF_USERNAME): cv.string,
                 vol.Required(CONF_PASSWORD): cv.string,
             }
@@ -63,6 +103,62 @@ class ClausiusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
+    async def _async_probe_pages(self) -> tuple[set[int | None], dict[str, str]]:
+        """Fetch all pages concurrently.
+
+        Returns the HTTP statuses, None for pages that could not be
+        requested, and the content of the pages read.
+        """
+        client = ClausiusClient(
+            self.hass,
+            self._data[CONF_HOST],
+            self._data[CONF_PORT],
+            self._data[CONF_USERNAME],
+            self._data[CONF_PASSWORD],
+        )
+        try:
+            responses = await asyncio.gather(
+                *(
+                    self._async_fetch_page(client, endpoint)
+                    for endpoint in CLAUSIUS_ENDPOINTS
+                )
+            )
+        finally:
+            await client.close()
+        statuses = {status for status, _ in responses}
+        pages = {
+            endpoint: content
+            for endpoint, (_, content) in zip(CLAUSIUS_ENDPOINTS, responses)
+            if content is not None
+        }
+        return statuses, pages
+
+    async def _async_fetch_page(
+        self, client: ClausiusClient, endpoint: str
+    ) -> tuple[int | None, str | None]:
+        """Fetch one page, return the HTTP status and the content read."""
+        try:
+            async with await client.get(endpoint) as response:
+                if response.status != 200:
+                    _LOGGER.warning(f"HTTP {response.status} for {endpoint}")
+                    return response.status, None
+                return response.status, await response.text(errors="replace")
+        except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+            _LOGGER.warning(f"Could not fetch {endpoint}: {err}")
+            return None, None
+
+    @callback
+    def _detect_layout(self, pages: dict[str, str]) -> None:
+        """Store the layout of the informacion.html page read."""
+        content = pages.get(CLAUSIUS_INFORMACION_PATH)
+        layout = detect_layout(content) if content is not None else None
+        if layout is None:
+            # Detected on the first poll that reads the page
+            _LOGGER.warning("Could not detect the layout of informacion.html")
+            return
+        _LOGGER.info(f"Detected {layout.profile} layout of informacion.html")
+        self._data[CONF_LAYOUT] = layout.as_dict()
+
     async def _async_create_entry(self) -> ConfigFlowResult:
         """Create the config entry."""
         return self.async_create_entry(
@@ -94,6 +190,7 @@ class ClausiusOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self._config_entry = config_entry
+        self._options: dict[str, Any] = {}
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
@@ -102,14 +199,69 @@ class ClausiusOptionsFlow(config_entries.OptionsFlow):
         errors = {}
 
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            self._options.update(user_input)
+            return await self.async_step_filters()
 
+        options = self._config_entry.options
+        # Options saved before the per-endpoint intervals only had a scan
+        # interval, it stays the default of the pages it used to set
+        scan_interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
         data_schema = vol.Schema(
             {
                 vol.Optional(
-                    "scan_interval",
-                    default=self._config_entry.options.get("scan_interval", 60),
+                    CONF_STATUS_INTERVAL,
+                    default=options.get(CONF_STATUS_INTERVAL, scan_interval),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Optional(
+                    CONF_TEMPERATURAS_INTERVAL,
+                    default=options.get(CONF_TEMPERATURAS_INTERVAL, scan_interval),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Optional(
+                    CONF_INFORMACION_INTERVAL,
+                    default=options.get(
+                        CONF_INFORMACION_INTERVAL, DEFAULT_INFORMACION_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=86400)),
+                vol.Optional(
+                    CONF_ADAPTIVE,
+                    default=options.get(CONF_ADAPTIVE, False),
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_ADAPTIVE_FLOOR,
+                    default=options.get(CONF_ADAPTIVE_FLOOR, DEFAULT_ADAPTIVE_FLOOR),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=600)),
+                vol.Optional(
+                    CONF_ADAPTIVE_CEILING,
+                    default=options.get(
+                        CONF_ADAPTIVE_CEILING, DEFAULT_ADAPTIVE_CEILING
+                    ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                vol.Optional(
+                    CONF_FIELD_TTL,
+                    default=options.get(CONF_FIELD_TTL, DEFAULT_FIELD_TTL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                vol.Optional(
+                    CONF_STREAMING,
+                    default=options.get(CONF_STREAMING, False),
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_AGGREGATE_INTERVAL,
+                    default=options.get(
+                        CONF_AGGREGATE_INTERVAL, DEFAULT_AGGREGATE_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=3600)),
+                vol.Optional(
+                    CONF_HEATING_FLOW,
+                    default=options.get(CONF_HEATING_FLOW, DEFAULT_HEATING_FLOW),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=500)),
+                vol.Optional(
+                    CONF_HEAT_CAPACITY,
+                    default=options.get(CONF_HEAT_CAPACITY, DEFAULT_HEAT_CAPACITY),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=5)),
+                vol.Optional(
+                    CONF_CAPTURE,
+                    default=options.get(CONF_CAPTURE, False),
+                ): cv.boolean,
             }
         )
 
@@ -118,3 +270,27 @@ class ClausiusOptionsFlow(config_entries.OptionsFlow):
             data_schema=data_schema,
             errors=errors,
         )
+
+    async def async_step_filters(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the deadband and hysteresis of the numeric sensors."""
+        if user_input is not None:
+            self._options.update(user_input)
+            return self.async_create_entry(title="", data=self._options)
+
+        options = self._config_entry.options
+        schema: dict[vol.Optional, Any] = {}
+        for key in CLAUSIUS_ENTITIES:
+            defaults = filter_defaults(key)
+            if defaults is None:
+                continue
+            for option_key, default in zip(filter_option_keys(key), defaults):
+                schema[
+                    vol.Optional(option_key, default=options.get(option_key, default))
+                ] = vol.All(vol.Coerce(float), vol.Range(min=0, max=10))
+
+        return self.async_show_form(
+            step_id="filters",
+            data_schema=vol.Schema(schema),
+        )
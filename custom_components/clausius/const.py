@@ -9,7 +9,54 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = "clausius"
 
 # Default configuration
-DEFAULT_SCAN_INTERVAL = 120  # seconds
+DEFAULT_SCAN_INTERVAL = 60  # seconds, status and temperature pages
+DEFAULT_REQUEST_TIMEOUT = 15  # seconds, per endpoint request
+DEFAULT_KEEPALIVE_TIMEOUT = 60  # seconds an idle device connection is kept
+DEFAULT_CYCLE_TIMEOUT = 20  # seconds, for one whole poll cycle
+DEFAULT_INFORMACION_INTERVAL = 600  # seconds, SPF and pressures change slowly
+STREAM_CHUNK_SIZE = 4096  # bytes read at a time in streaming mode
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4  # requests in flight across all devices
+DEFAULT_BREAKER_THRESHOLD = 3  # failed polls in a row before backing off
+DEFAULT_BACKOFF_BASE = 30  # seconds, first backoff delay, doubled per failure
+DEFAULT_BACKOFF_MAX = 1800  # seconds, longest backoff delay
+DEFAULT_HISTORY_SPAN = 3600  # seconds of samples kept in memory per field
+DEFAULT_AGGREGATE_INTERVAL = 300  # seconds, window of the aggregate sensors
+DEFAULT_MAX_SAMPLE_GAP = 900  # seconds between samples still integrated over
+DEFAULT_HEATING_FLOW = 0.0  # l/min, 0 leaves the thermal output unestimated
+DEFAULT_HEAT_CAPACITY = 4.186  # kJ/(l*K) of the heating medium, water
+DEFAULT_DUTY_WINDOW = 3600  # seconds, time constant of the rolling duty cycle
+DEFAULT_MIN_RUN_TIME = 600  # seconds, shorter compressor runs are short cycles
+DEFAULT_MAX_STARTS_PER_HOUR = 3  # more compressor starts are short cycling
+METRICS_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)  # ms
+DEFAULT_CAPTURE_FILE_SIZE = 10 * 1024 * 1024  # bytes of JSON per capture archive
+DEFAULT_CAPTURE_FILES = 20  # capture archives kept per device
+CAPTURE_DIRECTORY = f"{DOMAIN}_captures"  # in the Home Assistant config dir
+EXPORT_DIRECTORY = f"{DOMAIN}_exports"  # in the Home Assistant config dir
+EXPORT_CHUNK_ROWS = 1000  # rows held in memory and written at a time by exports
+DEFAULT_FIELD_TTL = 1800  # seconds a last known value is served after a failure
+FIELD_CACHE_SAVE_DELAY = 30  # seconds after a change the field cache is saved
+STATISTICS_SAVE_DELAY = 60  # seconds after a sample the open hours are saved
+COUNTER_SAVE_DELAY = 60  # seconds after a sample cycles and energy are saved
+DEFAULT_ADAPTIVE_FLOOR = 10  # seconds, adaptive interval while the state changes
+DEFAULT_ADAPTIVE_CEILING = 300  # seconds, adaptive interval of steady readings
+ADAPTIVE_BACKOFF = 1.5  # adaptive interval growth per poll of steady readings
+ADAPTIVE_TEMPERATURE_STEP = 0.5  # °C, smaller moves count as steady
+
+# Key in hass.data for resources shared by all config entries
+DATA_FLEET = f"{DOMAIN}_fleet"
+
+# Fired on every compressor start and stop
+EVENT_COMPRESSOR_CYCLE = f"{DOMAIN}_compressor_cycle"
+
+# Service writing the sample history of a device to a file
+SERVICE_EXPORT = "export"
+ATTR_DEVICE_ID = "device_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_FIELDS = "fields"
+ATTR_FORMAT = "format"
+ATTR_FILENAME = "filename"
+ATTR_SOURCE = "source"
 
 # Configuration keys
 CONF_HOST = "host"
@@ -17,12 +64,37 @@ CONF_PORT = "port"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_TEMPERATURAS_INTERVAL = "temperaturas_interval"
+CONF_STATUS_INTERVAL = "status_interval"
+CONF_INFORMACION_INTERVAL = "informacion_interval"
+CONF_STREAMING = "streaming"
+CONF_AGGREGATE_INTERVAL = "aggregate_interval"
+CONF_HEATING_FLOW = "heating_flow"
+CONF_HEAT_CAPACITY = "heat_capacity"
+CONF_CAPTURE = "capture"
+CONF_FIELD_TTL = "field_ttl"
+CONF_LAYOUT = "layout"
+CONF_ADAPTIVE = "adaptive"
+CONF_ADAPTIVE_FLOOR = "adaptive_floor"
+CONF_ADAPTIVE_CEILING = "adaptive_ceiling"
 
 # Clausius API endpoints
 CLAUSIUS_BASE_URL = "http://{host}:{port}/http/clausius"
 CLAUSIUS_TEMPERATURAS_PATH = "temperaturas.html"
 CLAUSIUS_STATUS_PATH = "status.html"
 CLAUSIUS_INFORMACION_PATH = "informacion.html"
+CLAUSIUS_ENDPOINTS = (
+    CLAUSIUS_TEMPERATURAS_PATH,
+    CLAUSIUS_STATUS_PATH,
+    CLAUSIUS_INFORMACION_PATH,
+)
+
+# Option key holding the polling interval of each endpoint
+CLAUSIUS_ENDPOINT_INTERVALS = {
+    CLAUSIUS_TEMPERATURAS_PATH: CONF_TEMPERATURAS_INTERVAL,
+    CLAUSIUS_STATUS_PATH: CONF_STATUS_INTERVAL,
+    CLAUSIUS_INFORMACION_PATH: CONF_INFORMACION_INTERVAL,
+}
 
 # Entity definitions - translation keys only
 CLAUSIUS_ENTITIES = {
@@ -112,9 +184,376 @@ CLAUSIUS_ENTITIES = {
         "translation_key": "clausius_spf_day",
         "icon": "mdi:chart-bell-curve",
         "unit_of_measurement": "SPF",
+    },
+    # Derived metrics, computed from the values above on every refresh
+    "heating_delta_t": {
+        "translation_key": "clausius_heating_delta_t",
+        "unit_of_measurement": "K",
+        "icon": "mdi:thermometer-lines",
+    },
+    "ground_delta_t": {
+        "translation_key": "clausius_ground_delta_t",
+        "unit_of_measurement": "K",
+        "icon": "mdi:thermometer-lines",
+    },
+    "thermal_power": {
+        "translation_key": "clausius_thermal_power",
+        "device_class": "power",
+        "state_class": "measurement",
+        "unit_of_measurement": "kW",
+        "icon": "mdi:radiator",
+    },
+    "thermal_energy": {
+        "translation_key": "clausius_thermal_energy",
+        "device_class": "energy",
+        "state_class": "total_increasing",
+        "unit_of_measurement": "kWh",
+        "icon": "mdi:radiator",
+    },
+    # Compressor cycle analytics
+    "compressor_starts": {
+        "translation_key": "clausius_compressor_starts",
+        "state_class": "total_increasing",
+        "icon": "mdi:counter",
+    },
+    "compressor_last_run": {
+        "translation_key": "clausius_compressor_last_run",
+        "device_class": "duration",
+        "unit_of_measurement": "min",
+        "icon": "mdi:timer-play-outline",
+    },
+    "compressor_last_idle": {
+        "translation_key": "clausius_compressor_last_idle",
+        "device_class": "duration",
+        "unit_of_measurement": "min",
+        "icon": "mdi:timer-pause-outline",
+    },
+    "compressor_rolling_duty": {
+        "translation_key": "clausius_compressor_rolling_duty",
+        "state_class": "measurement",
+        "unit_of_measurement": "%",
+        "icon": "mdi:engine",
+    },
+    "compressor_cycling": {
+        "translation_key": "clausius_compressor_cycling",
+        "icon": "mdi:sync-alert",
+    },
+}
+
+# Default deadband and hysteresis per device class, in the sensor's unit. A
+# value is published once it moves by the deadband, or by deadband plus
+# hysteresis when it turns back. Overridden per entity in the options.
+FILTER_DEFAULTS = {
+    "temperature": {"deadband": 0.2, "hysteresis": 0.1},
+    "pressure": {"deadband": 0.1, "hysteresis": 0.1},
+}
+
+# Status code maps, keyed by the device's data-value-type
+COMPRESSOR_STATUS_MAP = {
+    "0": "Compressor On",
+    "1": "Powering On",
+    "2": "Powering Off",
+    "3": "Wait",
+    "4": "Stop",
+    "5": "OK",
+}
+PUMP_STATUS_MAP = {
+    "0": "Alarm",
+    "1": "OK",
+}
+MODE_MAP = {
+    "0": "Zima",
+    "1": "Lato",
+    "2": "Auto",
+}
+COMPRESSOR_RUNNING = COMPRESSOR_STATUS_MAP["0"]
+COMPRESSOR_TRANSITIONS = (COMPRESSOR_STATUS_MAP["1"], COMPRESSOR_STATUS_MAP["2"])
+CYCLING_OK = "OK"
+CYCLING_SHORT = "Short cycling"
+
+# Fields sampled into in-memory ring buffers on every poll and summarised
+# by the aggregate sensors. compressor_running is 1 while the compressor
+# runs, so its mean is the duty cycle.
+AGGREGATE_FIELDS = (
+    "outside_temp",
+    "cwu_temp",
+    "glycol_input_temp",
+    "glycol_output_temp",
+    "water_heating_in_temp",
+    "water_heating_out_temp",
+    "glycol_pressure",
+    "water_presure",
+    "compressor_running",
+)
+
+# Entity definitions of the aggregate sensors, the window mean of each field
+AGGREGATE_ENTITIES = {
+    field: {
+        **CLAUSIUS_ENTITIES[field],
+        "translation_key": f"{CLAUSIUS_ENTITIES[field]['translation_key']}_mean",
+    }
+    for field in AGGREGATE_FIELDS
+    if field in CLAUSIUS_ENTITIES
+}
+AGGREGATE_ENTITIES["compressor_running"] = {
+    "translation_key": "clausius_compressor_duty",
+    "unit_of_measurement": "%",
+    "icon": "mdi:engine",
+    "scale": 100,
+}
+
+# Diagnostic sensors of the poll metrics, disabled by default: the cycle
+# time, and the latency, parse time and errors of each endpoint
+METRIC_ENTITIES = {
+    "poll_cycle_time": {
+        "translation_key": "clausius_poll_cycle_time",
+        "metric": "cycle_time",
+        "unit_of_measurement": "ms",
+        "icon": "mdi:timer-outline",
+    },
+}
+for _endpoint in CLAUSIUS_ENDPOINTS:
+    _name = _endpoint.removesuffix(".html")
+    METRIC_ENTITIES[f"{_name}_latency"] = {
+        "translation_key": f"clausius_{_name}_latency",
+        "endpoint": _endpoint,
+        "metric": "latency",
+        "unit_of_measurement": "ms",
+        "icon": "mdi:timer-outline",
+    }
+    METRIC_ENTITIES[f"{_name}_parse_time"] = {
+        "translation_key": f"clausius_{_name}_parse_time",
+        "endpoint": _endpoint,
+        "metric": "parse_time",
+        "unit_of_measurement": "ms",
+        "icon": "mdi:timer-cog-outline",
+    }
+    METRIC_ENTITIES[f"{_name}_errors"] = {
+        "translation_key": f"clausius_{_name}_errors",
+        "endpoint": _endpoint,
+        "metric": "errors",
+        "icon": "mdi:alert-circle-outline",
     }
+
+# Temperature differences derived from pairs of fields, as minuend and
+# subtrahend. Inputs and outputs are named from the heat pump, as for the
+# glycol: water_heating_out_temp is the water it sends to the heating (the
+# supply) and water_heating_in_temp the water coming back (the return), so
+# a heating loop taking heat has a positive delta-T.
+DELTA_T_FIELDS = {
+    "heating_delta_t": ("water_heating_out_temp", "water_heating_in_temp"),
+    "ground_delta_t": ("glycol_input_temp", "glycol_output_temp"),
+}
+
+# Hourly long-term statistics imported into the recorder: mean, min and max
+# of each field by statistic name and unit, plus the compressor run-time
+STATISTICS_MEAN_FIELDS = {
+    "outside_temp": ("Outside temperature", "°C"),
+    "cwu_temp": ("DHW temperature", "°C"),
+    "glycol_input_temp": ("Glycol input temperature", "°C"),
+    "glycol_output_temp": ("Glycol output temperature", "°C"),
+    "water_heating_in_temp": ("Water heating input temperature", "°C"),
+    "water_heating_out_temp": ("Water heating output temperature", "°C"),
+    "heating_delta_t": ("Heating delta T", "K"),
+    "ground_delta_t": ("Ground loop delta T", "K"),
+}
+STATISTICS_RUNTIME = "compressor_runtime"
+
+# Values computed by the coordinator, by the fetched fields they are
+# computed from
+DERIVED_SOURCE_FIELDS = {
+    **DELTA_T_FIELDS,
+    "thermal_power": DELTA_T_FIELDS["heating_delta_t"],
+    "thermal_energy": DELTA_T_FIELDS["heating_delta_t"],
+    "compressor_running": ("compressor_status",),
+    "compressor_starts": ("compressor_status",),
+    "compressor_last_run": ("compressor_status",),
+    "compressor_last_idle": ("compressor_status",),
+    "compressor_rolling_duty": ("compressor_status",),
+    "compressor_cycling": ("compressor_status",),
+}
+
+# Fetched fields each sensor depends on, by unique ID suffix. Only the
+# pages feeding an enabled sensor are polled; the diagnostic metric
+# sensors describe the polls and depend on no field.
+ENTITY_SOURCE_FIELDS = {
+    **{
+        key: DERIVED_SOURCE_FIELDS.get(key, (key,))
+        for key in CLAUSIUS_ENTITIES
+    },
+    **{
+        description["translation_key"].removeprefix("clausius_"): (
+            DERIVED_SOURCE_FIELDS.get(field, (field,))
+        )
+        for field, description in AGGREGATE_ENTITIES.items()
+    },
+}
+
+# Field extraction definitions for the page parsers. Each field is found by
+# an anchor in the markup; its value is read with "pattern" (tried in order)
+# from the anchor line or the line "line" lines below it, then converted.
+# Compiled once at import into a single-pass extractor per page.
+CLAUSIUS_FIELDS = {
+    # temperaturas.html
+    "outside_temp": {
+        "endpoint": CLAUSIUS_TEMPERATURAS_PATH,
+        "anchor": "exterior.png",
+        "line": 1,
+        "pattern": (r"<span>([-+]?\d*\.?\d+)</span>",),
+        "converter": "float",
+    },
+    "cwu_temp": {
+        "endpoint": CLAUSIUS_TEMPERATURAS_PATH,
+        "anchor": "shower.png",
+        "line": 1,
+        "pattern": (r">([-+]?\d*\.?\d+|\d+) &ordm;C", r">([-+]?\d*\.?\d+)"),
+        "converter": "float",
+    },
+    "pump_level": {
+        "endpoint": CLAUSIUS_TEMPERATURAS_PATH,
+        "anchor": "radiant.png",
+        "line": 1,
+        "pattern": (r"Level\s+(\d+)",),
+        "converter": "level",
+    },
+    # status.html
+    "on_off": {
+        "endpoint": CLAUSIUS_STATUS_PATH,
+        "anchor": 'id="button',
+        "line": 0,
+        "pattern": (r"(\d+)",),
+        "converter": "int",
+    },
+    "compressor_status": {
+        "endpoint": CLAUSIUS_STATUS_PATH,
+        "anchor": 'img id="compresor',
+        "line": 0,
+        "pattern": (r'data-value-type="(\d+)',),
+        "status_map": COMPRESSOR_STATUS_MAP,
+        "default": "Unknown",
+    },
+    "pump_status": {
+        "endpoint": CLAUSIUS_STATUS_PATH,
+        "anchor": 'id="estado',
+        "line": 0,
+        "pattern": (r'data-value-type="(\d+)',),
+        "status_map": PUMP_STATUS_MAP,
+    },
+    "mode": {
+        "endpoint": CLAUSIUS_STATUS_PATH,
+        "anchor": 'id="modo',
+        "line": 0,
+        "pattern": (r'data-value-type="(\d+)',),
+        "status_map": MODE_MAP,
+        "default": "Unknown",
+    },
+    # informacion.html values are read from the line they sit on ("hint"
+    # is the line in the known firmware, read as a fixed line number
+    # before), below the line holding their label. The anchors are the
+    # labels expected there; they were not taken from a device capture,
+    # so each device learns the label actually above its hint line on the
+    # first parse, and labels are compared without case, whitespace or
+    # entity differences. Once found, the line is cached per device and
+    # only the label above it is checked; on a miss the label is searched
+    # for nearest the hint, then the hint line is read as before.
+    "spf_year": {
+        "endpoint": CLAUSIUS_INFORMACION_PATH,
+        "anchor": "SPF anual",
+        "line": 1,
+        "hint": 50,
+        "pattern": (r"(\d*\.?\d+)",),
+        "converter": "float",
+    },
+    "spf_day": {
+        "endpoint": CLAUSIUS_INFORMACION_PATH,
+        "anchor": "SPF diario",
+        "line": 1,
+        "hint": 59,
+        "pattern": (r"(\d*\.?\d+)",),
+        "converter": "float",
+    },
+    "spf_month": {
+        "endpoint": CLAUSIUS_INFORMACION_PATH,
+        "anchor": "SPF mensual",
+        "line": 1,
+        "hint": 68,
+        "pattern": (r"(\d*\.?\d+)",),
+        "converter": "float",
+    },
+    "water_heating_in_temp": {
+        "endpoint": CLAUSIUS_INFORMACION_PATH,
+        "anchor": "Retorno calefacción",
+        "line": 1,
+        "hint": 299,
+        "pattern": (r"([-+]?\d*\.?\d+) &ordm;C",),
+        "converter": "float",
+    },
+    "water_heating_out_temp": {
+        "endpoint": CLAUSIUS_INFORMACION_PATH,
+        "anchor": "Impulsión calefacción",
+        "line": 1,
+        "hint": 302,
+        "pattern": (r"([-+]?\d*\.?\d+) &ordm;C",),
+        "converter": "float",
+    },
+    "water_presure": {
+        "endpoint": CLAUSIUS_INFORMACION_PATH,
+        "anchor": "Presión agua",
+        "line": 1,
+        "hint": 304,
+        "pattern": (r"(\d.\d) bar",),
+        "converter": "float",
+    },
+    "glycol_output_temp": {
+        "endpoint": CLAUSIUS_INFORMACION_PATH,
+        "anchor": "Salida glicol",
+        "line": 1,
+        "hint": 322,
+        "pattern": (r"([-+]?\d*\.?\d+) &ordm;C",),
+        "converter": "float",
+    },
+    "glycol_input_temp": {
+        "endpoint": CLAUSIUS_INFORMACION_PATH,
+        "anchor": "Entrada glicol",
+        "line": 1,
+        "hint": 325,
+        "pattern": (r"([-+]?\d*\.?\d+) &ordm;C",),
+        "converter": "float",
+    },
+    "glycol_pressure": {
+        "endpoint": CLAUSIUS_INFORMACION_PATH,
+        "anchor": "Presión glicol",
+        "line": 1,
+        "hint": 327,
+        "pattern": (r"(\d.\d) bar",),
+        "converter": "float",
+    },
 }
 
+# Line layouts of informacion.html by firmware: the line of every value.
+# temperaturas.html and status.html are read by their markup, the same on
+# every firmware. A page matching no profile gets its lines located as a
+# custom layout.
+LAYOUT_PROFILES = {
+    "classic": {
+        key: field["hint"]
+        for key, field in CLAUSIUS_FIELDS.items()
+        if "hint" in field
+    },
+}
+LAYOUT_CUSTOM = "custom"
+
+# Adaptive polling: pages polled between the floor and the ceiling, the
+# status fields whose changes drop the interval to the floor, and the
+# temperatures whose moves shorten it
+ADAPTIVE_ENDPOINTS = (CLAUSIUS_STATUS_PATH, CLAUSIUS_TEMPERATURAS_PATH)
+ADAPTIVE_STATE_FIELDS = ("compressor_status", "pump_status")
+ADAPTIVE_TEMPERATURE_FIELDS = tuple(
+    key
+    for key, entity in CLAUSIUS_ENTITIES.items()
+    if key in CLAUSIUS_FIELDS and entity.get("device_class") == "temperature"
+)
+
 # Default values for configuration
 DEFAULT_CONFIG = {
     CONF_HOST: "",
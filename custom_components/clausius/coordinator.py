@@ -0,0 +1,684 @@
+"""Data update coordinator of a Clausius heat pump."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import (
+    ADAPTIVE_ENDPOINTS,
+    CLAUSIUS_TEMPERATURAS_PATH,
+    CLAUSIUS_STATUS_PATH,
+    CLAUSIUS_INFORMACION_PATH,
+    CLAUSIUS_ENDPOINTS,
+    CLAUSIUS_ENDPOINT_INTERVALS,
+    CLAUSIUS_FIELDS,
+    CAPTURE_DIRECTORY,
+    CONF_ADAPTIVE,
+    CONF_ADAPTIVE_CEILING,
+    CONF_ADAPTIVE_FLOOR,
+    CONF_AGGREGATE_INTERVAL,
+    CONF_CAPTURE,
+    CONF_FIELD_TTL,
+    CONF_HEAT_CAPACITY,
+    CONF_HEATING_FLOW,
+    CONF_LAYOUT,
+    CONF_SCAN_INTERVAL,
+    CONF_STREAMING,
+    DEFAULT_ADAPTIVE_CEILING,
+    DEFAULT_ADAPTIVE_FLOOR,
+    DEFAULT_AGGREGATE_INTERVAL,
+    DEFAULT_CYCLE_TIMEOUT,
+    DEFAULT_FIELD_TTL,
+    DEFAULT_HEAT_CAPACITY,
+    DEFAULT_HEATING_FLOW,
+    DEFAULT_HISTORY_SPAN,
+    DEFAULT_INFORMACION_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DELTA_T_FIELDS,
+    DOMAIN,
+    ENTITY_SOURCE_FIELDS,
+    STREAM_CHUNK_SIZE,
+)
+from .adaptive import AdaptivePolling
+from .api import CircuitBreaker, ClausiusClient
+from .cache import FieldCache
+from .capture import CapturedResponse, CaptureWriter
+from .cycles import CompressorCycles
+from .derived import ThermalMetrics
+from .fleet import async_get_fleet
+from .history import SampleHistory
+from .metrics import PollMetrics
+from .statistics import HourlyStatistics
+from .parser import PAGE_EXTRACTORS, LineIndex, detect_layout_lines
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ClausiusDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching data from the Clausius heat pump."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize."""
+        self.clausius_config = entry.data
+        self.host = self.clausius_config["host"]
+        self.port = self.clausius_config["port"]
+        self.username = self.clausius_config["username"]
+        self.password = self.clausius_config["password"]
+
+        # Each endpoint is polled on its own interval, the coordinator ticks
+        # at the shortest one and only fetches the endpoints that are due
+        # The scan interval of options saved before per-endpoint intervals
+        scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        self._endpoint_intervals = {
+            endpoint: entry.options.get(
+                option,
+                DEFAULT_INFORMACION_INTERVAL
+                if endpoint == CLAUSIUS_INFORMACION_PATH
+                else scan_interval,
+            )
+            for endpoint, option in CLAUSIUS_ENDPOINT_INTERVALS.items()
+        }
+        # Longest interval of each endpoint
+        longest_intervals = dict(self._endpoint_intervals)
+        # In adaptive mode the status and temperature pages are polled
+        # between a floor and a ceiling instead, faster while the readings
+        # change
+        self._adaptive: AdaptivePolling | None = None
+        if entry.options.get(CONF_ADAPTIVE, False):
+            self._adaptive = AdaptivePolling(
+                entry.options.get(CONF_ADAPTIVE_FLOOR, DEFAULT_ADAPTIVE_FLOOR),
+                entry.options.get(CONF_ADAPTIVE_CEILING, DEFAULT_ADAPTIVE_CEILING),
+            )
+            for endpoint in ADAPTIVE_ENDPOINTS:
+                self._endpoint_intervals[endpoint] = self._adaptive.interval
+                longest_intervals[endpoint] = self._adaptive.ceiling
+        self._next_fetch: dict[str, float] = {}
+        # Endpoints polled, narrowed to those feeding enabled entities by
+        # async_select_endpoints
+        self._endpoints: tuple[str, ...] = CLAUSIUS_ENDPOINTS
+        self._endpoint_data: dict[str, dict[str, Any]] = {}
+        # Read pages in chunks and stop as soon as every field is found
+        self._streaming = entry.options.get(CONF_STREAMING, False)
+        # Raw responses written to archives for offline replay; captures
+        # need whole pages, so they turn streaming off
+        self._capture: CaptureWriter | None = None
+        if entry.options.get(CONF_CAPTURE, False):
+            self._capture = CaptureWriter(
+                hass, Path(hass.config.path(CAPTURE_DIRECTORY)), entry.entry_id
+            )
+            self._streaming = False
+        # Lines of the informacion.html values on this device, as detected
+        # by the config flow; detected again only when they stop matching
+        layout = entry.data.get(CONF_LAYOUT)
+        self._informacion_index = (
+            LineIndex.from_dict(layout) if layout else LineIndex()
+        )
+        self._layout = self._informacion_index.as_dict()
+        # Options the coordinator was built with, others need a reload
+        self.options = entry.options
+        # Fingerprint and parse result of the last body of each endpoint,
+        # plus the cache validators the device sent with it
+        self._page_cache: dict[str, tuple[bytes | None, dict[str, Any]]] = {}
+        self._page_validators: dict[str, dict[str, str]] = {}
+
+        # Every sample of the aggregated fields over the last hour, kept in
+        # memory; only the windowed summaries are written as states
+        self.aggregate_interval = entry.options.get(
+            CONF_AGGREGATE_INTERVAL, DEFAULT_AGGREGATE_INTERVAL
+        )
+        history_span = max(DEFAULT_HISTORY_SPAN, self.aggregate_interval)
+        self.history = SampleHistory(
+            math.ceil(history_span / min(self._endpoint_intervals.values()))
+        )
+        # Hourly aggregates imported as long-term statistics
+        self.statistics = HourlyStatistics(hass, entry.entry_id, self.host)
+        # Delta-T, thermal output and energy, derived on every refresh
+        self.thermal = ThermalMetrics(
+            hass,
+            entry.entry_id,
+            entry.options.get(CONF_HEATING_FLOW, DEFAULT_HEATING_FLOW),
+            entry.options.get(CONF_HEAT_CAPACITY, DEFAULT_HEAT_CAPACITY),
+        )
+        # Last known good value of every field, served until its TTL runs
+        # out; a field is kept for at least two polls of its page
+        field_ttl = entry.options.get(CONF_FIELD_TTL, DEFAULT_FIELD_TTL)
+        self.fields = FieldCache(
+            hass,
+            entry.entry_id,
+            {
+                key: max(field_ttl, 2 * longest_intervals[field["endpoint"]])
+                for key, field in CLAUSIUS_FIELDS.items()
+            },
+        )
+        # Latency, bytes, parse time and errors per endpoint, cycle time
+        self.metrics = PollMetrics()
+        # Compressor starts, run and idle times, duty cycle
+        self.cycles = CompressorCycles(hass, entry.entry_id, self.host)
+
+        # Polls of all devices are spread over the tick by the fleet
+        self.entry_id = entry.entry_id
+        self._fleet = async_get_fleet(hass)
+        self._fleet.register(self.entry_id)
+        self._tick = min(self._endpoint_intervals.values())
+        update_interval = timedelta(seconds=self._tick)
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=update_interval,
+            # Unchanged pages give equal data, skip notifying the entities
+            always_update=False,
+        )
+
+        self._client = ClausiusClient(
+            hass, self.host, self.port, self.username, self.password
+        )
+        self._breaker = CircuitBreaker()
+        self.base_url = self._client.base_url
+        self._hass = hass
+
+    def _due_endpoints(self, now: float) -> list[str]:
+        """Return endpoints whose polling interval has elapsed."""
+        # Half a tick of slack absorbs scheduling jitter of the coordinator
+        slack = self._tick / 2
+        return [
+            endpoint
+            for endpoint in self._endpoints
+            if self._next_fetch.get(endpoint, 0.0) <= now + slack
+        ]
+
+    @callback
+    def async_select_endpoints(self) -> None:
+        """Poll only the endpoints feeding an enabled entity.
+
+        Entities missing from the registry are yet to be added and count
+        as enabled. status.html is always polled, it probes an unreachable
+        device and drives the compressor cycle events.
+        """
+        registry = er.async_get(self.hass)
+        disabled = {
+            entity.unique_id
+            for entity in er.async_entries_for_config_entry(
+                registry, self.entry_id
+            )
+            if entity.disabled
+        }
+        used = {CLAUSIUS_STATUS_PATH}
+        for key, fields in ENTITY_SOURCE_FIELDS.items():
+            if f"{self.entry_id}_{key}" not in disabled:
+                used.update(CLAUSIUS_FIELDS[field]["endpoint"] for field in fields)
+        endpoints = tuple(
+            endpoint for endpoint in CLAUSIUS_ENDPOINTS if endpoint in used
+        )
+        if endpoints == self._endpoints:
+            return
+
+        for endpoint in set(self._endpoints) - used:
+            # Its cached values expire with their TTL
+            self._endpoint_data.pop(endpoint, None)
+            self._next_fetch.pop(endpoint, None)
+        self._endpoints = endpoints
+        self._tick = min(self._endpoint_intervals[endpoint] for endpoint in endpoints)
+        _LOGGER.debug(f"Polling {', '.join(endpoints)} of {self.host}")
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        """Return the polling state, metrics and data for diagnostics."""
+        return {
+            "endpoints": self._endpoints,
+            "layout": self._informacion_index.profile,
+            "endpoint_intervals": self._endpoint_intervals,
+            "breaker_failures": self._breaker.failures,
+            "last_update_success": self.last_update_success,
+            "metrics": self.metrics.as_dict(),
+            "field_ages": self.fields.ages(time.time()),
+            "expired_fields": sorted(self.fields.expired),
+            "data": self.data,
+        }
+
+    async def async_shutdown(self) -> None:
+        """Cancel polls, keep the statistics, give up the poll slot and connections."""
+        await super().async_shutdown()
+        await self.statistics.async_shutdown()
+        self._fleet.unregister(self.entry_id)
+        await self._client.close()
+        if self._capture is not None:
+            await self._capture.async_close()
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data from Clausius device."""
+        started = time.perf_counter()
+        try:
+            return await self._async_fetch_data()
+        finally:
+            self.metrics.cycle_time.record((time.perf_counter() - started) * 1000)
+            if self._capture is not None:
+                # Written off the poll path, the writer keeps the order
+                self.hass.async_create_background_task(
+                    self._capture.async_flush(), f"{DOMAIN} capture {self.host}"
+                )
+            if self._adaptive is not None:
+                self._set_adaptive_interval(self._adaptive.update())
+            if self._breaker.is_open:
+                # Sleep through the backoff instead of ticking
+                delay = max(self._breaker.retry_in(time.monotonic()), 1.0)
+            elif self._shutdown_requested:
+                # Unloaded mid-poll, the device has already left the fleet
+                delay = self._tick
+            else:
+                # Land the next poll on this device's slot in the fleet
+                delay = self._fleet.delay_to_slot(
+                    self.entry_id, self._tick, self.hass.loop.time()
+                )
+            self.update_interval = timedelta(seconds=delay)
+
+    def _set_adaptive_interval(self, interval: float) -> None:
+        """Poll the adaptive endpoints on a new interval."""
+        now = time.monotonic()
+        for endpoint in ADAPTIVE_ENDPOINTS:
+            self._endpoint_intervals[endpoint] = interval
+            # A shorter interval takes effect at once
+            if endpoint in self._next_fetch:
+                self._next_fetch[endpoint] = min(
+                    self._next_fetch[endpoint], now + interval
+                )
+        self._tick = min(
+            self._endpoint_intervals[endpoint] for endpoint in self._endpoints
+        )
+
+    async def _async_probe(self, now: float) -> bool:
+        """Probe an unreachable device with one small request."""
+        if self._breaker.retry_in(now) > 0:
+            return False
+
+        endpoint_data = await self._fetch_endpoint(CLAUSIUS_STATUS_PATH)
+        if not endpoint_data:
+            delay = self._breaker.record_failure(now)
+            _LOGGER.debug(
+                f"Device {self.host} still unreachable, next probe in {delay:.0f}s"
+            )
+            return False
+
+        _LOGGER.info(f"Device {self.host} is reachable again, resuming polling")
+        self._breaker.record_success()
+        self._endpoint_data[CLAUSIUS_STATUS_PATH] = endpoint_data
+        self._record_sample(time.time(), endpoint_data)
+        self._next_fetch[CLAUSIUS_STATUS_PATH] = (
+            now + self._endpoint_intervals[CLAUSIUS_STATUS_PATH]
+        )
+        return True
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch the due endpoints and merge their data."""
+        try:
+            successful_endpoints = 0
+            now = time.monotonic()
+            sampled_at = time.time()
+
+            # While backed off only a probe goes out; once it succeeds the
+            # remaining endpoints are fetched in the same cycle
+            probed = False
+            if self._breaker.is_open:
+                if not await self._async_probe(now):
+                    return self._get_offline_data()
+                probed = True
+            due_endpoints = self._due_endpoints(now)
+            if not due_endpoints:
+                # A refresh requested between ticks, nothing is due yet
+                return self._merge_data(sampled_at)
+
+            # Fetch due endpoints concurrently under one deadline for the
+            # whole cycle, so the slowest page sets the cycle latency
+            tasks = {
+                endpoint: asyncio.create_task(self._fetch_endpoint(endpoint))
+                for endpoint in due_endpoints
+            }
+            done, pending = await asyncio.wait(
+                tasks.values(), timeout=DEFAULT_CYCLE_TIMEOUT
+            )
+
+            # Cancel endpoints that missed the deadline, keep partial results
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+            for endpoint, task in tasks.items():
+                endpoint_data = {}
+                if task not in done:
+                    self.metrics.cycle_deadline_exceeded += 1
+                    _LOGGER.warning(
+                        f"Cycle deadline of {DEFAULT_CYCLE_TIMEOUT}s exceeded for {endpoint}"
+                    )
+                else:
+                    try:
+                        endpoint_data = task.result()
+                    except Exception as err:
+                        _LOGGER.warning(f"Failed to fetch {endpoint}: {err}")
+
+                if endpoint_data:
+                    self._endpoint_data[endpoint] = endpoint_data
+                    self._next_fetch[endpoint] = (
+                        now + self._endpoint_intervals[endpoint]
+                    )
+                    successful_endpoints += 1
+                    self._record_sample(sampled_at, endpoint_data)
+                    _LOGGER.debug(f"Successfully fetched data from {endpoint}")
+                else:
+                    # Failed endpoints stay due and are retried next tick
+                    self._endpoint_data.pop(endpoint, None)
+
+            # If no due endpoint answered, set offline mode
+            if successful_endpoints == 0 and not probed:
+                self._endpoint_data.clear()
+                self._next_fetch.clear()
+                delay = self._breaker.record_failure(now)
+                if self._breaker.failures == self._breaker.threshold:
+                    _LOGGER.warning(
+                        f"Device {self.host} unreachable after {self._breaker.failures} "
+                        f"polls - setting offline mode, retrying in {delay:.0f}s"
+                    )
+                elif not self._breaker.is_open:
+                    _LOGGER.warning(
+                        "No data received from any endpoint - setting offline mode"
+                    )
+                return self._get_offline_data()
+
+            if successful_endpoints:
+                self._breaker.record_success()
+
+            return self._merge_data(sampled_at)
+
+        except Exception as err:
+            _LOGGER.error(f"Error communicating with API: {err}")
+            return self._get_offline_data()
+
+    def apply_response(
+        self, response: CapturedResponse
+    ) -> tuple[dict[str, Any], dict[str, Any]] | None:
+        """Process a response fetched earlier as if it just arrived.
+
+        A page is parsed, a 304 reuses the last result of its endpoint.
+        Return the fields read from it and the merged data at its time,
+        None when it held no values.
+        """
+        if response.status == 200 and response.body is not None:
+            results = self._parse_endpoint_content(response.endpoint, response.text)
+        elif response.status == 304:
+            results = self._endpoint_data.get(response.endpoint, {})
+        else:
+            results = {}
+        if not results:
+            return None
+        self._endpoint_data[response.endpoint] = results
+        self._record_sample(response.time, results)
+        return results, self._merge_data(response.time)
+
+    def _merge_data(self, sampled_at: float) -> dict[str, Any]:
+        """Merge the last known good fields and add the derived metrics."""
+        data = self.fields.values(sampled_at)
+        # Integrate over the times the heating temperatures were fetched,
+        # so values held from an earlier poll add no energy
+        heated_at = self.fields.fetched_at(*DELTA_T_FIELDS["heating_delta_t"])
+        self.thermal.update(heated_at or sampled_at, data)
+        data.update(self.cycles.data)
+        return data
+
+    def _record_sample(self, timestamp: float, endpoint_data: dict[str, Any]) -> None:
+        """Feed freshly fetched data to the cache, history and statistics."""
+        self.fields.update(timestamp, endpoint_data)
+        if self._adaptive is not None:
+            self._adaptive.observe(endpoint_data)
+        self.history.record(timestamp, endpoint_data)
+        self.statistics.record(timestamp, endpoint_data)
+        if endpoint_data.get("compressor_status") is not None:
+            self.cycles.update(timestamp, endpoint_data["compressor_status"])
+
+    def _get_offline_data(self) -> dict[str, Any]:
+        """Return the last known good data when device is not reachable."""
+        return self._merge_data(time.time())
+
+    async def _fetch_endpoint(self, endpoint: str) -> dict[str, Any]:
+        """Fetch data from a specific Clausius endpoint."""
+        url = self._client.urls[endpoint]
+        # Probes of an unreachable device are expected to fail
+        log_failure = _LOGGER.debug if self._breaker.is_open else _LOGGER.warning
+        metrics = self.metrics.endpoints[endpoint]
+        metrics.requests += 1
+
+        try:
+            _LOGGER.debug(f"Fetching {endpoint} from {url}")
+
+            # Caps the requests in flight across all devices
+            async with self._fleet.request_slots:
+                requested_at = time.time()
+                started = time.perf_counter()
+                parsed_before = metrics.parse_time.total
+                response = await self._client.get(
+                    endpoint, self._page_validators.get(endpoint)
+                )
+                async with response:
+                    body = None
+                    if self._capture is not None and response.status == 200:
+                        # aiohttp keeps the body, _handle_response reads it again
+                        body = await response.read()
+                    results = await self._handle_response(endpoint, response)
+                # Latency of the transfer alone, parsing is timed apart
+                elapsed = (time.perf_counter() - started) * 1000
+                latency = elapsed - (metrics.parse_time.total - parsed_before)
+                metrics.latency.record(latency)
+                if self._capture is not None:
+                    self._capture.add(
+                        requested_at,
+                        endpoint,
+                        response.status,
+                        latency,
+                        response.get_encoding() if body is not None else "utf-8",
+                        response.headers,
+                        body,
+                    )
+                return results
+
+        except asyncio.TimeoutError:
+            metrics.timeouts += 1
+            log_failure(f"Timeout connecting to {endpoint}: {url}")
+            return {}
+        except (aiohttp.ClientError, Exception) as err:
+            metrics.connection_errors += 1
+            error_msg = str(err).lower()
+            if "dns" in error_msg or "name or service not known" in error_msg:
+                log_failure(f"DNS resolution failed for {endpoint}: {url} - {err}")
+            elif "timeout" in error_msg:
+                log_failure(f"Connection timeout for {endpoint}: {url} - {err}")
+            else:
+                log_failure(f"Connection error for {endpoint}: {url} - {err}")
+            return {}
+
+    async def _handle_response(
+        self, endpoint: str, response: aiohttp.ClientResponse
+    ) -> dict[str, Any]:
+        """Parse a response, reusing earlier results for unchanged pages."""
+        metrics = self.metrics.endpoints[endpoint]
+        if response.status == 304 and endpoint in self._page_cache:
+            _LOGGER.debug(f"{endpoint} not modified")
+            metrics.not_modified += 1
+            return self._page_cache[endpoint][1]
+
+        if response.status != 200:
+            metrics.http_errors[response.status] = (
+                metrics.http_errors.get(response.status, 0) + 1
+            )
+            _LOGGER.warning(f"HTTP {response.status} for {endpoint}: {response.url}")
+            return {}
+
+        self._store_validators(endpoint, response.headers)
+        if self._streaming:
+            # No fingerprint for a partly read page, keep the result
+            # for 304 answers only
+            results = await self._read_streaming(endpoint, response)
+            self._page_cache[endpoint] = (None, results)
+            return results
+
+        body = await response.read()
+        metrics.bytes_received += len(body)
+        _LOGGER.debug(f"Successfully fetched {endpoint}")
+
+        # Reuse the previous parse result for a byte-identical page
+        fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+        cached = self._page_cache.get(endpoint)
+        if cached and cached[0] == fingerprint:
+            _LOGGER.debug(f"{endpoint} unchanged, skipping parse")
+            return cached[1]
+
+        content = body.decode(response.get_encoding(), errors="replace")
+        results = self._parse_endpoint_content(endpoint, content)
+        self._page_cache[endpoint] = (fingerprint, results)
+        return results
+
+    async def _read_streaming(
+        self, endpoint: str, response: aiohttp.ClientResponse
+    ) -> dict[str, Any]:
+        """Extract fields while the page arrives, stop once all are found."""
+        metrics = self.metrics.endpoints[endpoint]
+        extraction = self._start_extraction(endpoint)
+        encoding = response.charset or "utf-8"
+        buffer = b""
+        received = 0
+        parse_time = 0.0
+
+        try:
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                buffer += chunk
+                end = buffer.rfind(b"\n")
+                if end < 0:
+                    continue
+                block, buffer = buffer[:end], buffer[end + 1 :]
+                started = time.perf_counter()
+                complete = extraction.feed(block.decode(encoding, errors="replace"))
+                parse_time += time.perf_counter() - started
+                if complete:
+                    # Everything found, drop the rest of the page
+                    _LOGGER.debug(
+                        f"All fields of {endpoint} found after {received} bytes"
+                    )
+                    response.close()
+                    return self._finish_extraction(endpoint, extraction)
+
+            started = time.perf_counter()
+            extraction.feed(buffer.decode(encoding, errors="replace"))
+            parse_time += time.perf_counter() - started
+            _LOGGER.debug(f"Successfully fetched {endpoint} ({received} bytes)")
+            return self._finish_extraction(endpoint, extraction)
+        finally:
+            metrics.bytes_received += received
+            metrics.parse_time.record(parse_time * 1000)
+
+    def _start_extraction(self, endpoint: str):
+        """Start a streaming extraction for an endpoint."""
+        if endpoint == CLAUSIUS_INFORMACION_PATH:
+            return PAGE_EXTRACTORS[endpoint].start(self._informacion_index)
+        return PAGE_EXTRACTORS[endpoint].start()
+
+    def _finish_extraction(self, endpoint: str, extraction) -> dict[str, Any]:
+        """Return the fields of a streamed page, checking informacion.html."""
+        results = extraction.finish()
+        if endpoint == CLAUSIUS_INFORMACION_PATH:
+            return self._check_layout(extraction.lines, results)
+        return results
+
+    def _store_validators(self, endpoint: str, response_headers) -> None:
+        """Remember ETag/Last-Modified for conditional requests."""
+        validators = {}
+        if etag := response_headers.get("ETag"):
+            validators["If-None-Match"] = etag
+        if last_modified := response_headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = last_modified
+        self._page_validators[endpoint] = validators
+
+    def _parse_endpoint_content(self, endpoint: str, content: str) -> dict[str, Any]:
+        """Parse content from Clausius endpoint."""
+        results = {}
+        started = time.perf_counter()
+
+        if endpoint == CLAUSIUS_TEMPERATURAS_PATH:
+            results = self._parse_temperaturas(content)
+        elif endpoint == CLAUSIUS_STATUS_PATH:
+            results = self._parse_status(content)
+        elif endpoint == CLAUSIUS_INFORMACION_PATH:
+            results = self._parse_informacion(content)
+
+        self.metrics.endpoints[endpoint].parse_time.record(
+            (time.perf_counter() - started) * 1000
+        )
+        return results
+
+    def _parse_temperaturas(self, content: str) -> dict[str, Any]:
+        """Parse temperaturas endpoint content."""
+        return PAGE_EXTRACTORS[CLAUSIUS_TEMPERATURAS_PATH].extract(content)
+
+    def _parse_status(self, content: str) -> dict[str, Any]:
+        """Parse status endpoint content."""
+        return PAGE_EXTRACTORS[CLAUSIUS_STATUS_PATH].extract(content)
+
+    def _parse_informacion(self, content: str) -> dict[str, Any]:
+        """Parse informacion endpoint content."""
+        lines = content.split("\n")
+        extractor = PAGE_EXTRACTORS[CLAUSIUS_INFORMACION_PATH]
+        results = extractor.extract_lines(lines, self._informacion_index)
+        return self._check_layout(lines, results)
+
+    def _check_layout(
+        self, lines: list[str], results: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Detect the informacion.html layout again when values moved.
+
+        Runs after every extraction of the page, whole or streamed, and
+        returns its results, extracted again when the layout changed.
+        """
+        extractor = PAGE_EXTRACTORS[CLAUSIUS_INFORMACION_PATH]
+        index = self._informacion_index
+        complete = len(results) == len(extractor.fields)
+        if complete and index.lines == self._layout["lines"]:
+            if index.labels != self._layout["labels"]:
+                # Nothing moved, labels were learned from the page
+                self._save_layout()
+            return results
+
+        # Values missing or moved, the firmware layout changed: match the
+        # known layouts, or keep the lines just located
+        layout = detect_layout_lines(lines, index)
+        if layout is None:
+            return results
+        _LOGGER.info(
+            f"Detected {layout.profile} layout of informacion.html on {self.host}"
+        )
+        if layout.lines != index.lines:
+            results = extractor.extract_lines(lines, layout)
+        self._informacion_index = layout
+        self._save_layout()
+        return results
+
+    def _save_layout(self) -> None:
+        """Store the detected informacion.html layout in the config entry."""
+        entry = self.config_entry
+        layout = self._layout = self._informacion_index.as_dict()
+        if entry is None or entry.data.get(CONF_LAYOUT) == layout:
+            return
+        self.hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_LAYOUT: layout}
+        )
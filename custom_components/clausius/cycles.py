@@ -0,0 +1,178 @@
+"""Compressor cycle analytics of a Clausius heat pump."""
+
+from __future__ import annotations
+
+from collections import deque
+import logging
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    COMPRESSOR_RUNNING,
+    COUNTER_SAVE_DELAY,
+    CYCLING_OK,
+    CYCLING_SHORT,
+    DEFAULT_DUTY_WINDOW,
+    DEFAULT_MAX_SAMPLE_GAP,
+    DEFAULT_MAX_STARTS_PER_HOUR,
+    DEFAULT_MIN_RUN_TIME,
+    DOMAIN,
+    EVENT_COMPRESSOR_CYCLE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+STORAGE_VERSION = 1
+
+
+def cycles_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store of the compressor cycles of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.cycles")
+
+
+class CompressorCycles:
+    """State machine over the compressor status of every status sample.
+
+    Each sample is a running/idle observation. A change of state is a
+    compressor start or stop: starts are counted, the run or idle period
+    it ends is measured and an event is fired. The duty cycle is an
+    exponentially weighted average with a one hour time constant, and
+    short cycling is flagged while a run that ended in the last hour was
+    too short or there were too many starts in the last hour; the window
+    rolls on with every sample. Every sample costs the same, no history
+    is kept beyond the starts of the last hour. The state is saved to
+    storage after every sample, so the start count keeps increasing
+    across restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, host: str) -> None:
+        """Initialize with the compressor state unknown."""
+        self._hass = hass
+        self._store = cycles_store(hass, entry_id)
+        self._event_data = {"entry_id": entry_id, "host": host}
+        self._running: bool | None = None
+        self._since: float | None = None
+        self._last_sample: float | None = None
+        self._recent_starts: deque[float] = deque()
+        # When the last run ended
+        self._stopped_at: float | None = None
+        self.starts = 0
+        self.last_run: float | None = None
+        self.last_idle: float | None = None
+        self.duty: float | None = None
+        self.short_cycling = False
+
+    async def async_load(self) -> None:
+        """Load the state saved by the last run."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        self._running = stored["running"]
+        self._since = stored["since"]
+        self._last_sample = stored["last_sample"]
+        self._recent_starts = deque(stored["recent_starts"])
+        self._stopped_at = stored["stopped_at"]
+        self.starts = stored["starts"]
+        self.last_run = stored["last_run"]
+        self.last_idle = stored["last_idle"]
+        self.duty = stored["duty"]
+        if self._last_sample is not None:
+            self._update_short_cycling(self._last_sample)
+        _LOGGER.debug(f"Loaded compressor cycles, {self.starts} starts")
+
+    def update(self, timestamp: float, status: str) -> None:
+        """Advance the state machine by one status sample."""
+        self._store.async_delay_save(self._data_to_save, COUNTER_SAVE_DELAY)
+        running = status == COMPRESSOR_RUNNING
+        last_sample = self._last_sample
+        self._last_sample = timestamp
+        if last_sample is None or timestamp - last_sample > DEFAULT_MAX_SAMPLE_GAP:
+            # Nothing is known about the time in between, start over
+            self._running = running
+            self._since = None
+            self._update_short_cycling(timestamp)
+            return
+
+        # The previous state held for the interval that just ended
+        previous = 1.0 if self._running else 0.0
+        if self.duty is None:
+            self.duty = previous
+        else:
+            weight = math.exp(-(timestamp - last_sample) / DEFAULT_DUTY_WINDOW)
+            self.duty = self.duty * weight + previous * (1 - weight)
+
+        if running == self._running:
+            self._update_short_cycling(timestamp)
+            return
+        duration = None if self._since is None else timestamp - self._since
+        self._running = running
+        self._since = timestamp
+        if running:
+            self.starts += 1
+            self.last_idle = duration
+            self._recent_starts.append(timestamp)
+        else:
+            self.last_run = duration
+            self._stopped_at = timestamp
+        self._update_short_cycling(timestamp)
+
+        self._hass.bus.async_fire(
+            EVENT_COMPRESSOR_CYCLE,
+            {
+                **self._event_data,
+                "type": "start" if running else "stop",
+                "duration": duration,
+                "starts": self.starts,
+                "short_cycling": self.short_cycling,
+            },
+        )
+
+    def _update_short_cycling(self, timestamp: float) -> None:
+        """Flag short cycling over the hour up to timestamp."""
+        since = timestamp - HOUR
+        while self._recent_starts and self._recent_starts[0] <= since:
+            self._recent_starts.popleft()
+        short_run = (
+            self.last_run is not None
+            and self.last_run < DEFAULT_MIN_RUN_TIME
+            and self._stopped_at is not None
+            and self._stopped_at > since
+        )
+        self.short_cycling = (
+            short_run or len(self._recent_starts) > DEFAULT_MAX_STARTS_PER_HOUR
+        )
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Return the cycle metrics as coordinator data."""
+        return {
+            "compressor_starts": self.starts,
+            "compressor_last_run": _minutes(self.last_run),
+            "compressor_last_idle": _minutes(self.last_idle),
+            "compressor_rolling_duty": (
+                None if self.duty is None else round(self.duty * 100, 1)
+            ),
+            "compressor_cycling": CYCLING_SHORT if self.short_cycling else CYCLING_OK,
+        }
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the state to save."""
+        return {
+            "running": self._running,
+            "since": self._since,
+            "last_sample": self._last_sample,
+            "recent_starts": list(self._recent_starts),
+            "stopped_at": self._stopped_at,
+            "starts": self.starts,
+            "last_run": self.last_run,
+            "last_idle": self.last_idle,
+            "duty": self.duty,
+        }
+
+
+def _minutes(seconds: float | None) -> float | None:
+    """Return a duration in minutes."""
+    return None if seconds is None else round(seconds / 60, 1)
@@ -0,0 +1,93 @@
+"""Thermal metrics derived from the polled values."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    COUNTER_SAVE_DELAY,
+    DEFAULT_MAX_SAMPLE_GAP,
+    DELTA_T_FIELDS,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def thermal_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store of the thermal energy of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.thermal")
+
+
+class ThermalMetrics:
+    """Derived metrics of one device, updated incrementally per refresh.
+
+    The temperature differences of the heating and ground loops come
+    straight from each refresh. The thermal output is the heating flow
+    times the heat capacity of the medium times the heating delta-T, and
+    its energy is integrated from one refresh to the next, so every
+    refresh costs the same no matter how long the integration has run.
+    The energy is saved to storage and keeps increasing across restarts.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, flow: float, heat_capacity: float
+    ) -> None:
+        """Initialize with the heating flow in l/min and kJ/(l*K)."""
+        self._store = thermal_store(hass, entry_id)
+        # kW of thermal output per kelvin of heating delta-T
+        self._kw_per_kelvin = flow / 60 * heat_capacity
+        self._last: tuple[float, float] | None = None
+        self.energy = 0.0
+
+    async def async_load(self) -> None:
+        """Load the energy integrated by the last run."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        self.energy = stored["energy"]
+        if (last := stored["last"]) is not None:
+            self._last = (last[0], last[1])
+        _LOGGER.debug(f"Loaded thermal energy {self.energy:.3f} kWh")
+
+    def update(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Add the derived metrics of a refresh to its data."""
+        for field, (minuend, subtrahend) in DELTA_T_FIELDS.items():
+            if data.get(minuend) is None or data.get(subtrahend) is None:
+                data[field] = None
+            else:
+                data[field] = round(data[minuend] - data[subtrahend], 2)
+
+        if not self._kw_per_kelvin:
+            data["thermal_power"] = data["thermal_energy"] = None
+            return
+
+        delta = data["heating_delta_t"]
+        if delta is None:
+            # No integration across refreshes without a reading
+            self._last = None
+            data["thermal_power"] = None
+            data["thermal_energy"] = round(self.energy, 3)
+            return
+
+        # Heat flowing back during defrost is not counted as output
+        power = max(0.0, delta * self._kw_per_kelvin)
+        self._store.async_delay_save(self._data_to_save, COUNTER_SAVE_DELAY)
+        if self._last is not None:
+            last_timestamp, last_power = self._last
+            elapsed = timestamp - last_timestamp
+            if 0 < elapsed <= DEFAULT_MAX_SAMPLE_GAP:
+                # Trapezoidal rule, kW over seconds to kWh
+                self.energy += (last_power + power) / 2 * elapsed / 3600
+        self._last = (timestamp, power)
+        data["thermal_power"] = round(power, 3)
+        data["thermal_energy"] = round(self.energy, 3)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the energy and the last output to save."""
+        return {"energy": self.energy, "last": self._last}
@@ -0,0 +1,246 @@
+"""Export of the data of a Clausius heat pump.
+
+Two sources can be exported:
+
+- captures: the archives written with the Capture traffic option. Every
+  response is parsed again, so all fields are exported for as far back
+  as the archives go.
+- history: the samples of the aggregated fields kept in memory, the last
+  hour, without capturing.
+
+Rows are streamed through a pipeline of generators, from the source to
+the file, so an export holds no more than a chunk of rows in memory
+however long its range is. A row holds the values fetched at one time,
+fields missing from it are left empty. CSV files have a header line:
+
+    time,outside_temp,compressor_status
+    2024-11-29T17:06:40+00:00,4.5,
+    2024-11-29T17:06:41+00:00,,Compressor On
+
+JSON lines files are gzip compressed, one object per row:
+
+    {"time": "2024-11-29T17:06:40+00:00", "outside_temp": 4.5}
+"""
+
+from __future__ import annotations
+
+import csv
+from datetime import datetime
+import gzip
+import heapq
+import io
+from itertools import groupby, islice
+import json
+import logging
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Sequence
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .capture import CapturedResponse, iter_captures
+from .const import (
+    AGGREGATE_FIELDS,
+    CLAUSIUS_FIELDS,
+    CLAUSIUS_INFORMACION_PATH,
+    EXPORT_CHUNK_ROWS,
+)
+from .history import SampleHistory
+from .parser import PAGE_EXTRACTORS, LineIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {"csv": ".csv", "jsonl": ".jsonl.gz"}
+
+# Fields each source can export
+EXPORT_SOURCES = {
+    "captures": tuple(CLAUSIUS_FIELDS),
+    "history": AGGREGATE_FIELDS,
+}
+
+Row = tuple[float, dict[str, Any]]
+
+
+def iter_history_rows(
+    history: SampleHistory, fields: Sequence[str], since: float, until: float
+) -> Iterator[Row]:
+    """Yield the samples of the fields between two times, oldest first."""
+    # Each buffer is in time order, merging them keeps it. until must not
+    # be in the future: polls overwrite the oldest samples while an export
+    # is being written, and the newer samples taking their place are then
+    # skipped instead of breaking the order.
+    streams = [_iter_samples(history, field, since, until) for field in fields]
+    merged = heapq.merge(*streams, key=lambda sample: sample[0])
+    for timestamp, samples in groupby(merged, key=lambda sample: sample[0]):
+        yield timestamp, {field: value for _, field, value in samples}
+
+
+def _iter_samples(
+    history: SampleHistory, field: str, since: float, until: float
+) -> Iterator[tuple[float, str, float]]:
+    """Yield the samples of a field between two times, tagged with it."""
+    for timestamp, value in history.buffers[field].samples(since):
+        if timestamp <= until:
+            yield timestamp, field, value
+
+
+def capture_archives(
+    directory: Path, prefix: str, since: float, until: float
+) -> list[Path]:
+    """Return the capture archives of a device holding responses in a range."""
+    started = {
+        archive: start
+        for archive in directory.glob(f"{prefix}-*.jsonl.gz")
+        if (start := _archive_start(archive, prefix)) is not None
+    }
+    archives = sorted(started)
+    starts = [started[archive] for archive in archives]
+    selected = []
+    for position, archive in enumerate(archives):
+        # Archives are started in time order, one ends when the next starts
+        following = starts[position + 1] if position + 1 < len(starts) else None
+        if following is None or following > since:
+            selected.append(archive)
+        # Responses are buffered until a flush starts the next archive, the
+        # first one started after the range can still hold some of it
+        if starts[position] > until:
+            break
+    return selected
+
+
+def _archive_start(archive: Path, prefix: str) -> float | None:
+    """Return when a capture archive was started, from its name."""
+    stamp = archive.name.removeprefix(f"{prefix}-").removesuffix(".jsonl.gz")
+    try:
+        # CaptureWriter names archives in local time
+        return datetime.strptime(stamp, "%Y%m%d-%H%M%S-%f").timestamp()
+    except ValueError:
+        return None
+
+
+def iter_capture_rows(
+    responses: Iterable[CapturedResponse],
+    fields: Sequence[str],
+    since: float,
+    until: float,
+) -> Iterator[Row]:
+    """Yield the fields parsed from captured responses between two times."""
+    wanted = set(fields)
+    endpoints = {CLAUSIUS_FIELDS[field]["endpoint"] for field in fields}
+    # informacion.html lines located once, as a coordinator would
+    index = LineIndex()
+    for response in responses:
+        if not since <= response.time <= until:
+            continue
+        if response.endpoint not in endpoints or response.status != 200:
+            continue
+        if response.body is None:
+            continue
+        extractor = PAGE_EXTRACTORS[response.endpoint]
+        if response.endpoint == CLAUSIUS_INFORMACION_PATH:
+            results = extractor.extract(response.text, index)
+        else:
+            results = extractor.extract(response.text)
+        values = {field: value for field, value in results.items() if field in wanted}
+        if values:
+            yield response.time, values
+
+
+def iter_lines(
+    rows: Iterable[Row], fields: Sequence[str], export_format: str
+) -> Iterator[str]:
+    """Yield the lines of an export file of the rows."""
+    if export_format == "jsonl":
+        for timestamp, values in rows:
+            yield json.dumps({"time": _format_time(timestamp), **values}) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(("time", *fields))
+    for timestamp, values in rows:
+        writer.writerow((_format_time(timestamp), *map(values.get, fields)))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+async def async_export_history(
+    hass: HomeAssistant,
+    history: SampleHistory,
+    path: Path,
+    export_format: str,
+    fields: Sequence[str],
+    since: float,
+    until: float,
+) -> int:
+    """Write the samples kept in memory to a file, return the rows."""
+    counter = _RowCounter()
+    rows = counter.count(iter_history_rows(history, fields, since, until))
+    lines = iter_lines(rows, fields, export_format)
+
+    # The buffers are only read in the event loop, while polls append to
+    # them; the executor only writes finished chunks
+    file = await hass.async_add_executor_job(_open, path, export_format)
+    try:
+        while chunk := list(islice(lines, EXPORT_CHUNK_ROWS)):
+            await hass.async_add_executor_job(file.writelines, chunk)
+    finally:
+        await hass.async_add_executor_job(file.close)
+
+    _LOGGER.debug(f"Exported {counter.rows} rows to {path}")
+    return counter.rows
+
+
+async def async_export_captures(
+    hass: HomeAssistant,
+    archives: Sequence[Path],
+    path: Path,
+    export_format: str,
+    fields: Sequence[str],
+    since: float,
+    until: float,
+) -> int:
+    """Write the fields of captured responses to a file, return the rows."""
+    counter = _RowCounter()
+    responses = iter_captures(archives)
+    rows = counter.count(iter_capture_rows(responses, fields, since, until))
+    lines = iter_lines(rows, fields, export_format)
+    # Archives are read, parsed and written in the executor, they share
+    # no state with the event loop
+    await hass.async_add_executor_job(_write, path, export_format, lines)
+    _LOGGER.debug(f"Exported {counter.rows} rows to {path}")
+    return counter.rows
+
+
+class _RowCounter:
+    """Counts the rows passing through a pipeline."""
+
+    def __init__(self) -> None:
+        """Initialize the count."""
+        self.rows = 0
+
+    def count(self, rows: Iterable[Row]) -> Iterator[Row]:
+        """Yield the rows, counting them."""
+        for row in rows:
+            self.rows += 1
+            yield row
+
+
+def _open(path: Path, export_format: str) -> IO[str]:
+    """Create the export file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if export_format == "csv":
+        return path.open("w", encoding="utf-8", newline="")
+    return gzip.open(path, "wt", encoding="utf-8")
+
+
+def _write(path: Path, export_format: str, lines: Iterable[str]) -> None:
+    """Write the lines to a new export file."""
+    with _open(path, export_format) as file:
+        file.writelines(lines)
+
+
+def _format_time(timestamp: float) -> str:
+    """Return a sample time as ISO 8601 in UTC."""
+    return dt_util.utc_from_timestamp(timestamp).isoformat()
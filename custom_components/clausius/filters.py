@@ -0,0 +1,80 @@
+"""Deadband and hysteresis filtering of sensor values."""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from .const import CLAUSIUS_ENTITIES, FILTER_DEFAULTS
+
+# Added to the band so readings exactly one band apart are not lost to
+# float rounding (20.3 - 20.1 < 0.2)
+_EPSILON = 1e-9
+
+
+class DeadbandFilter:
+    """Publish a numeric value only when it moves beyond a band.
+
+    A reading is published when it differs from the last published value
+    by at least deadband. When it moves against the direction of the last
+    published change, it must also clear hysteresis on top, so a value
+    flickering around one point does not publish on every poll.
+    """
+
+    __slots__ = ("deadband", "hysteresis", "_published", "_direction")
+
+    def __init__(self, deadband: float, hysteresis: float = 0.0) -> None:
+        """Initialize the filter."""
+        self.deadband = deadband
+        self.hysteresis = hysteresis
+        self._published: float | None = None
+        self._direction = 0
+
+    def update(self, value: Any) -> Any:
+        """Return the value to publish for a new reading."""
+        if not isinstance(value, (int, float)) or self._published is None:
+            # Unavailable or first readings always go through
+            self._published = value if isinstance(value, (int, float)) else None
+            self._direction = 0
+            return value
+
+        delta = value - self._published
+        direction = (delta > 0) - (delta < 0)
+        band = self.deadband
+        if direction and self._direction and direction != self._direction:
+            band += self.hysteresis
+        if abs(delta) + _EPSILON < band:
+            return self._published
+
+        self._published = value
+        self._direction = direction
+        return value
+
+
+def filter_option_keys(key: str) -> tuple[str, str]:
+    """Return the option keys of the deadband and hysteresis of an entity."""
+    return f"{key}_deadband", f"{key}_hysteresis"
+
+
+def filter_defaults(key: str) -> tuple[float, float] | None:
+    """Return the default deadband and hysteresis of an entity.
+
+    Defaults come from the device class in CLAUSIUS_ENTITIES; entities
+    without a default are not filtered.
+    """
+    defaults = FILTER_DEFAULTS.get(CLAUSIUS_ENTITIES[key].get("device_class"))
+    if defaults is None:
+        return None
+    return defaults["deadband"], defaults["hysteresis"]
+
+
+def build_filter(key: str, options: Mapping[str, Any]) -> DeadbandFilter | None:
+    """Return the filter configured for an entity, or None."""
+    defaults = filter_defaults(key)
+    if defaults is None:
+        return None
+    deadband_key, hysteresis_key = filter_option_keys(key)
+    deadband = options.get(deadband_key, defaults[0])
+    hysteresis = options.get(hysteresis_key, defaults[1])
+    if not deadband and not hysteresis:
+        return None
+    return DeadbandFilter(deadband, hysteresis)
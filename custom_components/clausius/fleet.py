@@ -0,0 +1,64 @@
+"""Domain-wide poll scheduling for several Clausius devices."""
+
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_FLEET, DEFAULT_MAX_CONCURRENT_REQUESTS
+
+
+class ClausiusFleet:
+    """Resources shared by the coordinators of all configured devices.
+
+    Every device gets a poll slot: devices are spread evenly over their
+    polling interval instead of all firing at the same moment. Requests of
+    all devices share one cap on how many may be in flight at once.
+    """
+
+    def __init__(self, max_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS) -> None:
+        """Initialize the fleet."""
+        self.request_slots = asyncio.Semaphore(max_requests)
+        self._devices: list[str] = []
+
+    @property
+    def devices(self) -> list[str]:
+        """Return the registered devices in slot order."""
+        return list(self._devices)
+
+    @callback
+    def register(self, device_id: str) -> None:
+        """Add a device, the slots of all devices are spread again."""
+        if device_id not in self._devices:
+            self._devices.append(device_id)
+
+    @callback
+    def unregister(self, device_id: str) -> None:
+        """Remove a device, the slots of all devices are spread again."""
+        if device_id in self._devices:
+            self._devices.remove(device_id)
+
+    def phase(self, device_id: str) -> float:
+        """Return the poll slot of a device as a fraction of its interval."""
+        return self._devices.index(device_id) / len(self._devices)
+
+    def delay_to_slot(self, device_id: str, interval: float, now: float) -> float:
+        """Return the delay from now to the next poll slot of a device.
+
+        The delay is kept between half and one and a half intervals, so a
+        device moving to a new slot never polls much faster or slower.
+        """
+        offset = self.phase(device_id) * interval
+        delay = interval - (now - offset) % interval
+        if delay < interval / 2:
+            delay += interval
+        return delay
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> ClausiusFleet:
+    """Return the fleet of this Home Assistant instance, creating it once."""
+    if DATA_FLEET not in hass.data:
+        hass.data[DATA_FLEET] = ClausiusFleet()
+    return hass.data[DATA_FLEET]
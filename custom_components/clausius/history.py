@@ -0,0 +1,102 @@
+"""In-memory sample history of the polled values."""
+
+from __future__ import annotations
+
+from array import array
+import math
+from typing import Any, Iterator, Mapping
+
+from .const import AGGREGATE_FIELDS, COMPRESSOR_RUNNING
+
+
+class RingBuffer:
+    """Fixed-size buffer of timestamped samples backed by two float arrays.
+
+    Appending overwrites the oldest sample once the buffer is full, so a
+    buffer costs 16 bytes per sample no matter how long it runs.
+    """
+
+    __slots__ = ("capacity", "_times", "_values", "_next", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty buffer."""
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, dropping the oldest one when full."""
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def samples(self, since: float = -math.inf) -> Iterator[tuple[float, float]]:
+        """Yield the samples taken at or after since, oldest first."""
+        start = (self._next - self._count) % self.capacity
+        for offset in range(self._count):
+            index = (start + offset) % self.capacity
+            if self._times[index] >= since:
+                yield self._times[index], self._values[index]
+
+    def summary(self, since: float) -> dict[str, Any] | None:
+        """Return min, max, mean and last of the samples since a time."""
+        count = 0
+        total = 0.0
+        low = math.inf
+        high = -math.inf
+        last = None
+        # Walk back from the newest sample until the window is left
+        index = self._next
+        for _ in range(self._count):
+            index = (index - 1) % self.capacity
+            if self._times[index] < since:
+                break
+            value = self._values[index]
+            if last is None:
+                last = value
+            count += 1
+            total += value
+            low = min(low, value)
+            high = max(high, value)
+        if not count:
+            return None
+        return {
+            "min": low,
+            "max": high,
+            "mean": total / count,
+            "last": last,
+            "samples": count,
+        }
+
+
+class SampleHistory:
+    """Ring buffers of the aggregated fields of one device."""
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize a buffer per field."""
+        self.buffers = {field: RingBuffer(capacity) for field in AGGREGATE_FIELDS}
+
+    def record(self, timestamp: float, data: Mapping[str, Any]) -> None:
+        """Sample the fields present in freshly fetched data."""
+        if data.get("compressor_status") is not None:
+            data = {
+                **data,
+                "compressor_running": data["compressor_status"] == COMPRESSOR_RUNNING,
+            }
+        for field, buffer in self.buffers.items():
+            value = data.get(field)
+            # Booleans are sampled as 0/1 so their mean is a duty cycle
+            if isinstance(value, (int, float)):
+                buffer.append(timestamp, float(value))
+
+    def summary(self, field: str, since: float) -> dict[str, Any] | None:
+        """Return the windowed summary of a field."""
+        return self.buffers[field].summary(since)
@@ -0,0 +1,111 @@
+"""Poll cycle instrumentation of a Clausius heat pump."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+from .const import CLAUSIUS_ENDPOINTS, METRICS_BUCKETS
+
+
+class Histogram:
+    """Counts of durations in fixed millisecond buckets.
+
+    Each bucket counts the observations up to its bound, the last one
+    everything above. Recording is a bisect and three additions.
+    """
+
+    __slots__ = ("counts", "total", "count", "last", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(METRICS_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.last: float | None = None
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """Add an observation in milliseconds."""
+        self.counts[bisect_left(METRICS_BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+        self.last = value
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        bounds = [f"<={bound}" for bound in METRICS_BUCKETS]
+        bounds.append(f">{METRICS_BUCKETS[-1]}")
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 2) if self.count else None,
+            "last_ms": None if self.last is None else round(self.last, 2),
+            "max_ms": round(self.max, 2),
+            "buckets_ms": dict(zip(bounds, self.counts)),
+        }
+
+
+class EndpointMetrics:
+    """Counters of the requests to one endpoint."""
+
+    __slots__ = (
+        "latency",
+        "parse_time",
+        "requests",
+        "bytes_received",
+        "not_modified",
+        "timeouts",
+        "connection_errors",
+        "http_errors",
+    )
+
+    def __init__(self) -> None:
+        """Initialize zeroed counters."""
+        self.latency = Histogram()
+        self.parse_time = Histogram()
+        self.requests = 0
+        self.bytes_received = 0
+        self.not_modified = 0
+        self.timeouts = 0
+        self.connection_errors = 0
+        self.http_errors: dict[int, int] = {}
+
+    @property
+    def errors(self) -> int:
+        """Return the failed requests of all kinds."""
+        return self.timeouts + self.connection_errors + sum(self.http_errors.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "requests": self.requests,
+            "bytes_received": self.bytes_received,
+            "not_modified": self.not_modified,
+            "timeouts": self.timeouts,
+            "connection_errors": self.connection_errors,
+            "http_errors": dict(self.http_errors),
+            "latency": self.latency.as_dict(),
+            "parse_time": self.parse_time.as_dict(),
+        }
+
+
+class PollMetrics:
+    """Instrumentation of the poll cycles of one device."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics of every endpoint."""
+        self.endpoints = {endpoint: EndpointMetrics() for endpoint in CLAUSIUS_ENDPOINTS}
+        self.cycle_time = Histogram()
+        self.cycle_deadline_exceeded = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics for diagnostics."""
+        return {
+            "cycle_time": self.cycle_time.as_dict(),
+            "cycle_deadline_exceeded": self.cycle_deadline_exceeded,
+            "endpoints": {
+                endpoint: metrics.as_dict()
+                for endpoint, metrics in self.endpoints.items()
+            },
+        }
@@ -0,0 +1,446 @@
+"""Compiled page extractors for the Clausius integration."""
+
+from __future__ import annotations
+
+import html
+import logging
+import re
+from typing import Any, Callable
+
+from .const import (
+    CLAUSIUS_ENDPOINTS,
+    CLAUSIUS_FIELDS,
+    CLAUSIUS_INFORMACION_PATH,
+    LAYOUT_CUSTOM,
+    LAYOUT_PROFILES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_TAG_RE = re.compile(r"<[^>]*>")
+
+CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "float": float,
+    "int": int,
+    "level": lambda value: f"Level {value}",
+}
+
+
+def label_text(line: str) -> str:
+    """Return the text of a line as labels are compared.
+
+    Tags are dropped, entities decoded, case and whitespace folded, so
+    "<td>Presi&oacute;n  Agua</td>" reads as "presión agua".
+    """
+    return " ".join(html.unescape(_TAG_RE.sub(" ", line)).casefold().split())
+
+
+class CompiledField:
+    """Field definition with its patterns compiled."""
+
+    __slots__ = ("key", "anchor", "line", "patterns", "convert")
+
+    def __init__(self, key: str, definition: dict[str, Any]) -> None:
+        """Compile a field definition from CLAUSIUS_FIELDS."""
+        self.key = key
+        self.anchor = definition["anchor"]
+        self.line = definition.get("line", 0)
+        self.patterns = tuple(re.compile(p) for p in definition["pattern"])
+
+        if "status_map" in definition:
+            status_map = definition["status_map"]
+            default = definition.get("default")
+            self.convert = lambda value: status_map.get(value.strip().lower(), default)
+        else:
+            self.convert = CONVERTERS[definition.get("converter", "float")]
+
+    def extract(self, line: str) -> Any:
+        """Return the converted value found in line, or None."""
+        for pattern in self.patterns:
+            match = pattern.search(line)
+            if match:
+                return self.convert(match.group(1))
+        return None
+
+
+class PageExtractor:
+    """Single-pass extractor for all anchored fields of one page.
+
+    All anchors of the page are joined into one alternation, so a page is
+    scanned once by the regex engine no matter how many fields it has. The
+    alternation is plain and case-sensitive and runs over the lowercased
+    page, which keeps the engine's first-character prefilter usable.
+    """
+
+    def __init__(self, endpoint: str, fields: dict[str, dict[str, Any]]) -> None:
+        """Compile the fields of a page."""
+        self.endpoint = endpoint
+        self.fields = {key: CompiledField(key, d) for key, d in fields.items()}
+        # Lowercased anchor -> field
+        self.anchors = {
+            d["anchor"].lower(): self.fields[key] for key, d in fields.items()
+        }
+        pattern = "|".join(re.escape(anchor) for anchor in self.anchors)
+        self.anchor_re = re.compile(pattern)
+        # For the rare page whose length changes when lowercased
+        self.anchor_re_ignorecase = re.compile(pattern, re.IGNORECASE)
+
+    def start(self) -> Extraction:
+        """Start a new extraction that is fed page content in blocks."""
+        return Extraction(self)
+
+    def extract(self, content: str) -> dict[str, Any]:
+        """Extract all fields from a complete page."""
+        extraction = self.start()
+        extraction.feed(content)
+        return extraction.finish()
+
+
+class Extraction:
+    """State of one page being extracted.
+
+    Blocks fed in must consist of whole lines; the end of a block is
+    treated as the end of a line.
+    """
+
+    __slots__ = ("_extractor", "_pending", "results")
+
+    def __init__(self, extractor: PageExtractor) -> None:
+        """Initialize the extraction."""
+        self._extractor = extractor
+        # Fields whose anchor was seen but whose value line is still to come
+        self._pending: list[tuple[CompiledField, int]] = []
+        self.results: dict[str, Any] = {}
+
+    @property
+    def complete(self) -> bool:
+        """Return True once every field of the page has been found."""
+        return len(self.results) == len(self._extractor.fields)
+
+    def feed(self, block: str) -> bool:
+        """Extract fields from a block of lines, return True when complete."""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            for field, lines_left in pending:
+                self._extract_at(field, block, 0, lines_left - 1)
+
+        extractor = self._extractor
+        lowered = block.lower()
+        if len(lowered) == len(block):
+            matches = extractor.anchor_re.finditer(lowered)
+        else:
+            matches = extractor.anchor_re_ignorecase.finditer(block)
+
+        for match in matches:
+            field = extractor.anchors[match.group().lower()]
+            if field.key in self.results:
+                continue
+            start = block.rfind("\n", 0, match.start()) + 1
+            self._extract_at(field, block, start, field.line)
+
+        return self.complete
+
+    def finish(self) -> dict[str, Any]:
+        """Return the results once the whole page has been fed."""
+        return self.results
+
+    def _extract_at(
+        self, field: CompiledField, block: str, start: int, skip: int
+    ) -> None:
+        """Extract field from the line skip lines below the one at start."""
+        for _ in range(skip):
+            newline = block.find("\n", start)
+            if newline < 0:
+                # Value line is in the next block
+                self._pending.append((field, skip))
+                return
+            start = newline + 1
+            skip -= 1
+
+        end = block.find("\n", start)
+        line = block[start:] if end < 0 else block[start:end]
+        value = field.extract(line)
+        if value is not None:
+            self.results[field.key] = value
+            _LOGGER.debug(f"Found {field.key}: {value}")
+
+
+class LineIndex:
+    """Located lines of an indexed page, kept per device across polls."""
+
+    __slots__ = ("profile", "lines", "labels")
+
+    def __init__(self, profile: str | None = None) -> None:
+        """Initialize an empty index of a layout profile."""
+        self.profile = profile
+        # Field key -> line number of its value
+        self.lines: dict[str, int] = {}
+        # Field key -> label_text of the line above its value on this device
+        self.labels: dict[str, str] = {}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the index for storage in a config entry."""
+        return {
+            "profile": self.profile,
+            "lines": dict(self.lines),
+            "labels": dict(self.labels),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LineIndex:
+        """Return an index stored with as_dict."""
+        index = cls(data["profile"])
+        index.lines = dict(data["lines"])
+        index.labels = dict(data.get("labels", {}))
+        return index
+
+
+class IndexedPageExtractor:
+    """Extractor for pages whose values sit on known lines.
+
+    Every value sits a fixed number of lines below its label. Labels are
+    compared by label_text, and a line is labelled for a field when it
+    holds the label learned for it on this device, or its expected label,
+    the field's anchor. Once a field is found its line and label are
+    cached, and later polls only check the label above and the pattern.
+    On a miss the label is searched for nearest first around the hint,
+    shifted by the displacement already found for the fields above it.
+    When it is found nowhere, the value is read from the hint line, as
+    fixed line numbers always were, and the label above it is learned.
+    """
+
+    def __init__(self, endpoint: str, fields: dict[str, dict[str, Any]]) -> None:
+        """Compile the fields of a page, ordered by their hint line."""
+        self.endpoint = endpoint
+        ordered = sorted(fields.items(), key=lambda item: item[1]["hint"])
+        self.fields = {key: CompiledField(key, d) for key, d in ordered}
+        self.hints = {key: d["hint"] for key, d in ordered}
+        self.labels = {key: label_text(d["anchor"]) for key, d in ordered}
+
+    def start(self, index: LineIndex | None = None) -> IndexedExtraction:
+        """Start a new extraction that is fed page content in blocks."""
+        return IndexedExtraction(self, index if index is not None else LineIndex())
+
+    def extract(self, content: str, index: LineIndex | None = None) -> dict[str, Any]:
+        """Extract all fields from a complete page.
+
+        index is updated in place, so passing the same LineIndex on every
+        poll keeps located lines cached.
+        """
+        return self.extract_lines(content.split("\n"), index)
+
+    def extract_lines(
+        self,
+        lines: list[str],
+        index: LineIndex | None = None,
+        relocate: bool = True,
+    ) -> dict[str, Any]:
+        """Extract all fields from the lines of a page.
+
+        With relocate False only the cached lines are checked, which is
+        safe on a page that has not been read completely yet.
+        """
+        if index is None:
+            index = LineIndex()
+        results = {}
+        shift = 0
+        # label_text of the lines looked at, by line number
+        texts: dict[int, str] = {}
+
+        for key, field in self.fields.items():
+            hint = self.hints[key]
+            line_no = index.lines.get(key, hint)
+            value = self._extract_at(key, field, lines, line_no, index, texts)
+
+            if value is None:
+                if not relocate:
+                    continue
+                found = self._locate(key, field, lines, hint + shift, index, texts)
+                if found is not None:
+                    line_no, value = found
+                    _LOGGER.info(
+                        f"Located {key} in {self.endpoint} at line {line_no} "
+                        f"(expected {index.lines.get(key, hint)})"
+                    )
+                else:
+                    # As fixed line numbers were read before labels
+                    value = field.extract(lines[hint]) if hint < len(lines) else None
+                    if value is None:
+                        _LOGGER.debug(f"Could not locate {key} in {self.endpoint}")
+                        continue
+                    line_no = hint
+                    _LOGGER.info(
+                        f"No label of {key} in {self.endpoint}, read line {hint} "
+                        "and learned the label above it"
+                    )
+                index.labels.pop(key, None)
+
+            if key not in index.labels:
+                index.labels[key] = self._text(lines, line_no - field.line, texts)
+            index.lines[key] = line_no
+            shift = line_no - hint
+            results[key] = value
+            _LOGGER.debug(f"Found {key}: {value}")
+
+        return results
+
+    def _extract_at(
+        self,
+        key: str,
+        field: CompiledField,
+        lines: list[str],
+        line_no: int,
+        index: LineIndex,
+        texts: dict[int, str],
+    ) -> Any:
+        """Return the value at line_no when its label is in place, or None."""
+        label_no = line_no - field.line
+        if label_no < 0 or line_no >= len(lines):
+            return None
+        text = self._text(lines, label_no, texts)
+        if text != index.labels.get(key) and self.labels[key] not in text:
+            return None
+        return field.extract(lines[line_no])
+
+    def _locate(
+        self,
+        key: str,
+        field: CompiledField,
+        lines: list[str],
+        expected: int,
+        index: LineIndex,
+        texts: dict[int, str],
+    ) -> tuple[int, Any] | None:
+        """Return the line and value of the labelled value nearest expected."""
+        for distance in range(max(expected, len(lines) - expected) + 1):
+            for line_no in (expected - distance, expected + distance):
+                value = self._extract_at(key, field, lines, line_no, index, texts)
+                if value is not None:
+                    return line_no, value
+        return None
+
+    @staticmethod
+    def _text(lines: list[str], line_no: int, texts: dict[int, str]) -> str:
+        """Return the label_text of a line, computed once per extraction."""
+        text = texts.get(line_no)
+        if text is None:
+            text = texts[line_no] = label_text(lines[line_no])
+        return text
+
+
+class IndexedExtraction:
+    """State of one indexed page being extracted from blocks of lines.
+
+    Once the lines up to the last cached value have arrived and every
+    field verifies there, the extraction is complete without the rest of
+    the page. Otherwise the whole page is read and relocated in finish().
+    """
+
+    __slots__ = ("_extractor", "_index", "_lines", "_needed", "results")
+
+    def __init__(self, extractor: IndexedPageExtractor, index: LineIndex) -> None:
+        """Initialize the extraction."""
+        self._extractor = extractor
+        self._index = index
+        self._lines: list[str] = []
+        # Lines needed to verify every cached value, None reads the page
+        self._needed: int | None = (
+            max(index.lines.values()) + 1
+            if len(index.lines) == len(extractor.fields)
+            else None
+        )
+        self.results: dict[str, Any] = {}
+
+    @property
+    def complete(self) -> bool:
+        """Return True once every field of the page has been found."""
+        return len(self.results) == len(self._extractor.fields)
+
+    @property
+    def lines(self) -> list[str]:
+        """Return the lines of the page fed so far."""
+        return self._lines
+
+    def feed(self, block: str) -> bool:
+        """Collect a block of lines, return True when complete."""
+        self._lines.extend(block.split("\n"))
+        if self._needed is not None and len(self._lines) >= self._needed:
+            self.results = self._extractor.extract_lines(
+                self._lines, self._index, relocate=False
+            )
+            if not self.complete:
+                self._needed = None
+        return self.complete
+
+    def finish(self) -> dict[str, Any]:
+        """Return the results once the whole page has been fed."""
+        if not self.complete:
+            self.results = self._extractor.extract_lines(self._lines, self._index)
+        return self.results
+
+
+def _build_extractors() -> dict[str, PageExtractor | IndexedPageExtractor]:
+    """Group CLAUSIUS_FIELDS by endpoint and compile one extractor per page."""
+    extractors = {}
+    for endpoint in CLAUSIUS_ENDPOINTS:
+        fields = {
+            key: definition
+            for key, definition in CLAUSIUS_FIELDS.items()
+            if definition["endpoint"] == endpoint
+        }
+        if not fields:
+            continue
+        if all("hint" in definition for definition in fields.values()):
+            extractors[endpoint] = IndexedPageExtractor(endpoint, fields)
+        else:
+            extractors[endpoint] = PageExtractor(endpoint, fields)
+    return extractors
+
+
+PAGE_EXTRACTORS = _build_extractors()
+
+
+def detect_layout(content: str, located: LineIndex | None = None) -> LineIndex | None:
+    """Return the layout of an informacion.html page."""
+    return detect_layout_lines(content.split("\n"), located)
+
+
+def detect_layout_lines(
+    lines: list[str], located: LineIndex | None = None
+) -> LineIndex | None:
+    """Return the layout of the lines of an informacion.html page.
+
+    The known profiles are tried first, a profile matches when every value
+    sits on its line. Otherwise the lines of located, an index the page
+    was already extracted with, are kept as a custom layout; without one
+    the values are located first. None when no value was found.
+    """
+    extractor = PAGE_EXTRACTORS[CLAUSIUS_INFORMACION_PATH]
+    for profile, profile_lines in LAYOUT_PROFILES.items():
+        index = LineIndex(profile)
+        index.lines.update(profile_lines)
+        if located is not None:
+            index.labels.update(located.labels)
+        results = extractor.extract_lines(lines, index, relocate=False)
+        if len(results) == len(extractor.fields):
+            return index
+
+    if located is None:
+        located = LineIndex()
+        extractor.extract_lines(lines, located)
+    if not located.lines:
+        return None
+    for profile, profile_lines in LAYOUT_PROFILES.items():
+        # Every value was found on the lines of a profile, some of them
+        # under labels learned from the page
+        if located.lines == profile_lines:
+            return _copy_index(located, profile)
+    return _copy_index(located, LAYOUT_CUSTOM)
+
+
+def _copy_index(index: LineIndex, profile: str) -> LineIndex:
+    """Return a copy of an index under a profile name."""
+    copy = LineIndex(profile)
+    copy.lines = dict(index.lines)
+    copy.labels = dict(index.labels)
+    return copy
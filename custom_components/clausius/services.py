@@ -0,0 +1,148 @@
+"""Services of the Clausius integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import math
+from pathlib import Path
+import time
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    ATTR_DEVICE_ID,
+    ATTR_END,
+    ATTR_FIELDS,
+    ATTR_FILENAME,
+    ATTR_FORMAT,
+    ATTR_SOURCE,
+    ATTR_START,
+    CAPTURE_DIRECTORY,
+    DOMAIN,
+    EXPORT_DIRECTORY,
+    SERVICE_EXPORT,
+)
+from .coordinator import ClausiusDataUpdateCoordinator
+from .export import (
+    EXPORT_FORMATS,
+    EXPORT_SOURCES,
+    async_export_captures,
+    async_export_history,
+    capture_archives,
+)
+
+EXPORT_FIELDS = tuple(
+    dict.fromkeys(field for fields in EXPORT_SOURCES.values() for field in fields)
+)
+
+EXPORT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_SOURCE, default="history"): vol.In(EXPORT_SOURCES),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_FIELDS): vol.All(cv.ensure_list, [vol.In(EXPORT_FIELDS)]),
+        vol.Optional(ATTR_FORMAT, default="csv"): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_FILENAME): cv.string,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def _async_export(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call.data.get(ATTR_DEVICE_ID))
+        source = call.data[ATTR_SOURCE]
+        export_format = call.data[ATTR_FORMAT]
+        kept = EXPORT_SOURCES[source]
+        fields = list(dict.fromkeys(call.data.get(ATTR_FIELDS, kept)))
+        if unknown := [field for field in fields if field not in kept]:
+            raise ServiceValidationError(
+                f"Fields {', '.join(unknown)} are not kept in the {source} source"
+            )
+
+        # Nothing newer than the call is exported
+        since = _timestamp(call.data.get(ATTR_START), -math.inf)
+        until = min(_timestamp(call.data.get(ATTR_END), math.inf), time.time())
+        if since > until:
+            raise ServiceValidationError("The export must start before it ends")
+
+        filename = call.data.get(ATTR_FILENAME)
+        if filename is None:
+            stamp = dt_util.now().strftime("%Y%m%d-%H%M%S")
+            filename = f"{slugify(coordinator.host)}-{stamp}"
+            filename += EXPORT_FORMATS[export_format]
+        elif Path(filename).name != filename or filename.startswith("."):
+            raise ServiceValidationError(
+                f"Invalid file name {filename}, exports are written to the "
+                f"{EXPORT_DIRECTORY} folder"
+            )
+        path = Path(hass.config.path(EXPORT_DIRECTORY, filename))
+
+        if source == "history":
+            rows = await async_export_history(
+                hass, coordinator.history, path, export_format, fields, since, until
+            )
+        else:
+            archives = await hass.async_add_executor_job(
+                capture_archives,
+                Path(hass.config.path(CAPTURE_DIRECTORY)),
+                coordinator.entry_id,
+                since,
+                until,
+            )
+            if not archives:
+                raise ServiceValidationError(
+                    "No captured traffic of this device in the range, enable the "
+                    "Capture traffic option or export the default history source"
+                )
+            rows = await async_export_captures(
+                hass, archives, path, export_format, fields, since, until
+            )
+        if call.return_response:
+            return {"path": str(path), "rows": rows}
+        return None
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        _async_export,
+        schema=EXPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _get_coordinator(
+    hass: HomeAssistant, device_id: str | None
+) -> ClausiusDataUpdateCoordinator:
+    """Return the coordinator of a device, the only one when not given."""
+    coordinators: dict[str, ClausiusDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+    if device_id is None:
+        if len(coordinators) == 1:
+            return next(iter(coordinators.values()))
+        raise ServiceValidationError(
+            "Select the Clausius heat pump to export, none or several are set up"
+        )
+    if (device := dr.async_get(hass).async_get(device_id)) is not None:
+        for entry_id in device.config_entries:
+            if entry_id in coordinators:
+                return coordinators[entry_id]
+    raise ServiceValidationError(f"Device {device_id} is not a Clausius heat pump")
+
+
+def _timestamp(value: datetime | None, default: float) -> float:
+    """Return a service time as a timestamp, naive ones are local."""
+    return default if value is None else dt_util.as_timestamp(value)
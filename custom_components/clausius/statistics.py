@@ -0,0 +1,225 @@
+"""Hourly long-term statistics of a Clausius heat pump."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any, Mapping
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import (
+    COMPRESSOR_RUNNING,
+    DEFAULT_MAX_SAMPLE_GAP,
+    DELTA_T_FIELDS,
+    DOMAIN,
+    STATISTICS_MEAN_FIELDS,
+    STATISTICS_RUNTIME,
+    STATISTICS_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+
+STORAGE_VERSION = 1
+
+
+class _Hour:
+    """Running aggregates of one clock hour."""
+
+    __slots__ = ("fields", "runtime")
+
+    def __init__(self) -> None:
+        """Initialize an empty hour."""
+        # Field to [total, min, max, count]
+        self.fields: dict[str, list[float]] = {}
+        self.runtime = 0.0
+
+    def add(self, field: str, value: float) -> None:
+        """Add a sample of a field."""
+        stats = self.fields.get(field)
+        if stats is None:
+            self.fields[field] = [value, value, value, 1]
+        else:
+            stats[0] += value
+            stats[1] = min(stats[1], value)
+            stats[2] = max(stats[2], value)
+            stats[3] += 1
+
+
+class HourlyStatistics:
+    """Aggregates samples per hour and imports them as external statistics.
+
+    Every sample is folded into running totals of its hour, so nothing but
+    one small record per open hour is kept. Closed hours are imported into
+    the recorder in one batch per statistic, keeping months of history in
+    the compact statistics tables instead of in raw states. The hours not
+    imported yet are saved to storage a minute after every change, and
+    written by the store's final write when Home Assistant stops, so a
+    restart does not lose them; an unload imports the closed hours and
+    saves the open ones at once.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, host: str) -> None:
+        """Initialize the statistics of a device."""
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics")
+        self._host = host
+        self._prefix = f"{DOMAIN}:{slugify(entry_id)}"
+        self._hours: dict[float, _Hour] = {}
+        self._running_since: float | None = None
+        self._runtime_sum: float | None = None
+        # Hours before this were imported already and are not reopened
+        self._flushed_until = 0.0
+
+    async def async_load(self) -> None:
+        """Load the hours the last run did not import."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        for start, (fields, runtime) in stored["hours"].items():
+            hour = self._hours[float(start)] = _Hour()
+            hour.fields = fields
+            hour.runtime = runtime
+        self._running_since = stored["running_since"]
+        self._flushed_until = stored["flushed_until"]
+        _LOGGER.debug(f"Loaded {len(self._hours)} open hours of statistics")
+
+    async def async_shutdown(self) -> None:
+        """Import the closed hours and save the open ones."""
+        await self.async_flush()
+        await self._store.async_save(self._data_to_save())
+
+    def statistic_id(self, field: str) -> str:
+        """Return the statistic ID of a field."""
+        return f"{self._prefix}_{field}"
+
+    def _hour(self, timestamp: float) -> _Hour:
+        """Return the hour a timestamp falls in."""
+        start = timestamp - timestamp % HOUR
+        hour = self._hours.get(start)
+        if hour is None:
+            hour = self._hours[start] = _Hour()
+        return hour
+
+    def record(self, timestamp: float, data: Mapping[str, Any]) -> None:
+        """Fold freshly fetched data into the hour it was sampled in."""
+        hour = self._hour(timestamp)
+        for field in STATISTICS_MEAN_FIELDS:
+            if field in DELTA_T_FIELDS:
+                minuend, subtrahend = DELTA_T_FIELDS[field]
+                if data.get(minuend) is None or data.get(subtrahend) is None:
+                    continue
+                hour.add(field, data[minuend] - data[subtrahend])
+            elif data.get(field) is not None:
+                hour.add(field, data[field])
+        self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+
+        status = data.get("compressor_status")
+        if status is None:
+            return
+        # The compressor counts as running from a sample that saw it run
+        # to the next one, split over the hours in between
+        since = self._running_since
+        if since is not None and timestamp - since <= DEFAULT_MAX_SAMPLE_GAP:
+            while since < timestamp:
+                end = min(timestamp, since - since % HOUR + HOUR)
+                if since >= self._flushed_until:
+                    self._hour(since).runtime += end - since
+                since = end
+        self._running_since = timestamp if status == COMPRESSOR_RUNNING else None
+
+    async def async_flush(self, now: datetime | None = None) -> None:
+        """Import every closed hour into the recorder."""
+        cutoff = dt_util.utcnow().timestamp() - HOUR
+        closed = sorted(start for start in self._hours if start <= cutoff)
+        if not closed:
+            return
+        hours = [(start, self._hours.pop(start)) for start in closed]
+        self._flushed_until = closed[-1] + HOUR
+        # Saved without them, a restart must not import them again
+        self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+
+        if "recorder" not in self._hass.config.components:
+            _LOGGER.debug(f"Recorder not loaded, dropping {len(hours)} hours")
+            return
+
+        for field, (name, unit) in STATISTICS_MEAN_FIELDS.items():
+            rows = [
+                StatisticData(
+                    start=dt_util.utc_from_timestamp(start),
+                    mean=stats[0] / stats[3],
+                    min=stats[1],
+                    max=stats[2],
+                )
+                for start, hour in hours
+                if (stats := hour.fields.get(field))
+            ]
+            if rows:
+                self._add(field, f"{name} mean", unit, rows, has_mean=True)
+
+        if self._runtime_sum is None:
+            self._runtime_sum = await self._async_last_sum(STATISTICS_RUNTIME)
+        rows = []
+        for start, hour in hours:
+            hours_run = hour.runtime / HOUR
+            self._runtime_sum += hours_run
+            rows.append(
+                StatisticData(
+                    start=dt_util.utc_from_timestamp(start),
+                    state=hours_run,
+                    sum=self._runtime_sum,
+                )
+            )
+        self._add(STATISTICS_RUNTIME, "Compressor run-time", "h", rows, has_sum=True)
+        _LOGGER.debug(f"Imported {len(hours)} hours of statistics for {self._host}")
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the hours not imported yet and the compressor state."""
+        return {
+            "hours": {
+                start: [hour.fields, hour.runtime]
+                for start, hour in self._hours.items()
+            },
+            "running_since": self._running_since,
+            "flushed_until": self._flushed_until,
+        }
+
+    def _add(
+        self,
+        field: str,
+        name: str,
+        unit: str,
+        rows: list[StatisticData],
+        has_mean: bool = False,
+        has_sum: bool = False,
+    ) -> None:
+        """Import the rows of one statistic."""
+        metadata = StatisticMetaData(
+            has_mean=has_mean,
+            has_sum=has_sum,
+            name=f"Clausius {self._host} {name}",
+            source=DOMAIN,
+            statistic_id=self.statistic_id(field),
+            unit_of_measurement=unit,
+        )
+        async_add_external_statistics(self._hass, metadata, rows)
+
+    async def _async_last_sum(self, field: str) -> float:
+        """Return the last imported sum of a statistic, to continue from."""
+        statistic_id = self.statistic_id(field)
+        last = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics, self._hass, 1, statistic_id, True, {"sum"}
+        )
+        if last.get(statistic_id):
+            return last[statistic_id][0]["sum"] or 0.0
+        return 0.0